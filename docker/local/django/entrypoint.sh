@@ -14,14 +14,14 @@ export DATABASE_URL="postgres://${POSTGRES_USER}:${POSTGRES_PASSWORD}@${POSTGRES
 python << END
 import sys
 import time
-import psycopg2
+import psycopg
 
 suggest_unrecoverable_after = 30
 start = time.time()
 
 while True:
     try:
-        psycopg2.connect(
+        psycopg.connect(
             dbname="${POSTGRES_DB}",
             user="${POSTGRES_USER}",
             password="${POSTGRES_PASSWORD}",
@@ -30,7 +30,7 @@ while True:
 
         )
         break
-    except psycopg2.OperationalError as error:
+    except psycopg.OperationalError as error:
         sys.stderr.write("Waiting for PostgreSQL to become available...\n")
         if time.time() - start > suggest_unrecoverable_after:
             sys.stderr.write(
@@ -0,0 +1,64 @@
+# Closed-loop HTTP load test: `concurrency` clients request one URL back to back for `duration` seconds, then the
+# throughput and latency percentiles are printed. Point it at a server started each way to compare them, e.g.
+#     python manage.py runserver 8000
+#     DJANGO_SECRET_KEY=... DJANGO_SETTINGS_MODULE=config.settings.production gunicorn --config python:config.gunicorn
+#     python benchmarks/load_test.py http://localhost:8000/api/v1/favorites/customers/1/ -H "Authorization: Bearer ..."
+# Multiple workers only pay off with cores to run them on: compare on a multi-core host, with the load generator on
+# another machine or pinned to cores the server does not use (taskset). On one shared core all three servers measure
+# the same.
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _client(client: httpx.AsyncClient, url: str, deadline: float, latencies: list, errors: list):
+    while time.monotonic() < deadline:
+        started_at = time.monotonic()
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        if response.is_success:
+            latencies.append(time.monotonic() - started_at)
+        else:
+            errors.append(str(response.status_code))
+
+
+async def run(url: str, concurrency: int, duration: float, headers: dict) -> dict:
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.monotonic() + duration
+        await asyncio.gather(*(_client(client, url, deadline, latencies, errors) for _ in range(concurrency)))
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / duration,
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("url")
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-d", "--duration", type=float, default=20)
+    parser.add_argument("-H", "--header", action="append", default=[], help='Extra header, "Name: value".')
+    options = parser.parse_args()
+
+    headers = dict(header.split(": ", 1) for header in options.header)
+    result = asyncio.run(run(options.url, options.concurrency, options.duration, headers))
+    print(
+        f"{result['requests']} requests, {result['errors']} errors, {result['rps']:.1f} req/s, "
+        f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Queries per successful add-favorite request. Not part of the default test run:
+#     pytest benchmarks -s
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from v1.customers.tests.factories import CustomerFactory
+from v1.favorites.caches import set_cached_product
+from v1.favorites.products import product_cache_data
+from v1.favorites.tests.factories import ProductFactory
+
+REQUESTS = 20
+
+
+def _queries_per_add(api_client, product_ids, prepare=None):
+    customers = CustomerFactory.create_batch(len(product_ids))
+    total = 0
+    for customer, product_id in zip(customers, product_ids):
+        if prepare:
+            prepare(product_id)
+        url = reverse("add_favorite_product", args=[customer.id])
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(url, {"product_id": product_id})
+        assert response.status_code == status.HTTP_201_CREATED
+        total += len(context.captured_queries)
+    return total / len(product_ids)
+
+
+@pytest.mark.django_db
+def test_add_favorite_queries(api_user_authenticated, fake_catalog):
+    cached = [product.id for product in ProductFactory.create_batch(REQUESTS)]
+    in_database = [product.id for product in ProductFactory.create_batch(REQUESTS)]
+    from_catalog = list(range(1, REQUESTS + 1))
+    for product_id in from_catalog:
+        fake_catalog.add_product(product_id)
+    products = {product.id: product for product in ProductFactory._meta.model.objects.filter(id__in=cached)}
+
+    results = {
+        "product cached": _queries_per_add(
+            api_user_authenticated,
+            cached,
+            lambda product_id: set_cached_product(product_id, product_cache_data(products[product_id])),
+        ),
+        "product in database": _queries_per_add(api_user_authenticated, in_database),
+        "product from catalog": _queries_per_add(api_user_authenticated, from_catalog),
+    }
+
+    print()
+    for scenario, queries in results.items():
+        print(f"{scenario:<24}{queries:>6.1f} queries/request")
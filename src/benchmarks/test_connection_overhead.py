@@ -0,0 +1,50 @@
+# Database time per request with a new connection each time, a persistent connection and the psycopg pool. Not part
+# of the default test run:
+#     pytest benchmarks -s
+import time
+
+import pytest
+from django.db import connection
+from django.db.utils import ConnectionHandler
+
+REQUESTS = 200
+
+
+def _request(db):
+    # What a request does around its queries: close_old_connections() runs on request_started and request_finished.
+    db.close_if_unusable_or_obsolete()
+    with db.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    db.close_if_unusable_or_obsolete()
+
+
+def _ms_per_request(settings_dict: dict) -> float:
+    db = ConnectionHandler({"default": settings_dict})["default"]
+    try:
+        _request(db)
+        started_at = time.perf_counter()
+        for _ in range(REQUESTS):
+            _request(db)
+        return (time.perf_counter() - started_at) / REQUESTS * 1000
+    finally:
+        db.close()
+        if db.pool is not None:
+            db.close_pool()
+
+
+@pytest.mark.usefixtures("django_db_setup")
+def test_connection_overhead(django_db_blocker):
+    pytest.importorskip("psycopg_pool")
+    base = {**connection.settings_dict, "CONN_HEALTH_CHECKS": True, "OPTIONS": {}}
+    modes = {
+        "new connection": {**base, "CONN_MAX_AGE": 0},
+        "persistent connection": {**base, "CONN_MAX_AGE": 60},
+        "psycopg pool": {**base, "CONN_MAX_AGE": 0, "OPTIONS": {"pool": {"min_size": 1, "max_size": 2}}},
+    }
+
+    with django_db_blocker.unblock():
+        results = {mode: _ms_per_request(settings_dict) for mode, settings_dict in modes.items()}
+
+    print()
+    for mode, milliseconds in results.items():
+        print(f"{mode:<24}{milliseconds:>8.3f} ms/request")
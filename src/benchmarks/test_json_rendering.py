@@ -0,0 +1,86 @@
+# Serialization and rendering time for the favorites and customer lists, with DRF's JSONRenderer and the orjson
+# renderer. Not part of the default test run:
+#     pytest benchmarks -s
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from v1.common.renderers import ORJSONRenderer
+from v1.customers.models import Customer
+from v1.customers.serializers import CustomerSerializer, customer_representations
+from v1.customers.views import favorite_products_data
+from v1.favorites.models import Favorite, FavoriteProduct, Product
+from v1.favorites.tests.factories import ProductFactory
+from v1.favorites.views import favorite_product_data, favorite_product_rows
+
+SIZES = (10, 100, 1000)
+ROUNDS = 20
+
+
+def _ms(function) -> float:
+    function()
+    started_at = time.perf_counter()
+    for _ in range(ROUNDS):
+        function()
+    return (time.perf_counter() - started_at) / ROUNDS * 1000
+
+
+def _create_products(size: int) -> list[Product]:
+    products = ProductFactory.build_batch(size)
+    for index, product in enumerate(products, start=1):
+        product.id = size * 10 + index
+    return Product.objects.bulk_create(products)
+
+
+def _create_customers(size: int, product) -> list[Customer]:
+    # Each customer has one favorite product, so the list renders a small favorites tree per item.
+    customers = Customer.objects.bulk_create(
+        Customer(name=f"Customer {index}", email=f"customer-{size}-{index}@example.com") for index in range(size)
+    )
+    favorites = Favorite.objects.bulk_create(Favorite(customer=customer) for customer in customers)
+    FavoriteProduct.objects.bulk_create(FavoriteProduct(favorite=favorite, product=product) for favorite in favorites)
+    return customers
+
+
+def _create_favorites(size: int) -> int:
+    customer = Customer.objects.create(name="Favorites", email=f"favorites-{size}@example.com")
+    FavoriteProduct.objects.bulk_create(
+        FavoriteProduct(favorite_id=customer.id, product=product) for product in _create_products(size)
+    )
+    return customer.id
+
+
+def _favorites_list(customer_id: int) -> list:
+    return [favorite_product_data(row) for row in favorite_product_rows(customer_id)]
+
+
+def _customer_list(customer_ids: list[int]) -> list:
+    # What CustomerListCreate.list() renders for a page of these customers.
+    customers = Customer.objects.select_related("favorite").filter(id__in=customer_ids).order_by("id")
+    return customer_representations(customers, CustomerSerializer.Meta.fields, favorite_products_data(customer_ids))
+
+
+@pytest.mark.django_db
+def test_json_rendering():
+    renderers = {"json": JSONRenderer(), "orjson": ORJSONRenderer()}
+    product = ProductFactory(id=1)
+    results = []
+    for size in SIZES:
+        customer_ids = [customer.id for customer in _create_customers(size, product)]
+        favorites_customer_id = _create_favorites(size)
+        payloads = {
+            "favorites list": (lambda: _favorites_list(favorites_customer_id), _favorites_list(favorites_customer_id)),
+            "customer list": (lambda: _customer_list(customer_ids), _customer_list(customer_ids)),
+        }
+        for name, (serialize, data) in payloads.items():
+            assert renderers["orjson"].render(data) == renderers["json"].render(data)
+            timings = {key: _ms(lambda renderer=renderer: renderer.render(data)) for key, renderer in renderers.items()}
+            results.append((name, size, _ms(serialize), timings["json"], timings["orjson"]))
+
+    print()
+    print(f"{'payload':<16}{'items':>6}{'serialize':>12}{'json':>10}{'orjson':>10}{'speedup':>9}")
+    for name, size, serialize, json_ms, orjson_ms in results:
+        print(
+            f"{name:<16}{size:>6}{serialize:>10.3f}ms{json_ms:>8.3f}ms{orjson_ms:>8.3f}ms{json_ms / orjson_ms:>8.1f}x"
+        )
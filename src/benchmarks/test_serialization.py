@@ -0,0 +1,94 @@
+# Per-item serialization cost of the DRF serializers and the hand-rolled representations, on rows already loaded
+# from the database. Not part of the default test run:
+#     pytest benchmarks -s
+import time
+
+import pytest
+from django.db.models import Prefetch
+
+from v1.customers.models import Customer
+from v1.customers.serializers import CustomerSerializer, customer_representations
+from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.serializers import (
+    PRODUCT_REPRESENTATION_FIELDS,
+    FavoriteProductSerializer,
+    ProductSerializer,
+    product_row_representation,
+)
+from v1.favorites.tests.factories import ProductFactory
+
+CUSTOMERS = 200
+PRODUCTS_PER_CUSTOMER = 5
+ROUNDS = 5
+
+
+def _us_per_item(function, items: int) -> float:
+    function()
+    started_at = time.perf_counter()
+    for _ in range(ROUNDS):
+        function()
+    return (time.perf_counter() - started_at) / ROUNDS / items * 1_000_000
+
+
+def _create_customers():
+    products = ProductFactory.build_batch(PRODUCTS_PER_CUSTOMER)
+    for index, product in enumerate(products, start=1):
+        product.id = index
+    products = Product.objects.bulk_create(products)
+    for index in range(CUSTOMERS):
+        customer = Customer.objects.create(name=f"Customer {index}", email=f"customer-{index}@example.com")
+        FavoriteProduct.objects.bulk_create(
+            FavoriteProduct(favorite_id=customer.id, product=product) for product in products
+        )
+
+
+def _customer_representations(customers, rows):
+    favorite_products = {customer.id: [] for customer in customers}
+    for favorite_id, *product_row in rows:
+        favorite_products[favorite_id].append({"product": product_row_representation(product_row)})
+    return customer_representations(customers, CustomerSerializer.Meta.fields, favorite_products)
+
+
+@pytest.mark.django_db
+def test_serialization():
+    _create_customers()
+    favorite_products = list(FavoriteProduct.objects.select_related("product").order_by("created_at", "id"))
+    products = [favorite_product.product for favorite_product in favorite_products]
+    customers = list(
+        Customer.objects.select_related("favorite")
+        .prefetch_related(
+            Prefetch(
+                "favorite__favoriteproduct_set",
+                queryset=FavoriteProduct.objects.select_related("product").order_by("created_at", "id"),
+            )
+        )
+        .order_by("id")
+    )
+    rows = list(
+        FavoriteProduct.objects.order_by("created_at", "id").values_list(
+            "favorite_id", *(f"product__{field}" for field in PRODUCT_REPRESENTATION_FIELDS)
+        )
+    )
+    product_rows = [row[1:] for row in rows]
+    assert _customer_representations(customers, rows) == CustomerSerializer(customers, many=True).data
+
+    results = {
+        "product": (
+            _us_per_item(lambda: ProductSerializer(products, many=True).data, len(products)),
+            _us_per_item(lambda: [product_row_representation(row) for row in product_rows], len(products)),
+        ),
+        "favorite product": (
+            _us_per_item(lambda: FavoriteProductSerializer(favorite_products, many=True).data, len(products)),
+            _us_per_item(lambda: [{"product": product_row_representation(row)} for row in product_rows], len(products)),
+        ),
+        "customer": (
+            _us_per_item(lambda: CustomerSerializer(customers, many=True).data, len(customers)),
+            _us_per_item(lambda: _customer_representations(customers, rows), len(customers)),
+        ),
+    }
+
+    print()
+    print(f"{'item':<18}{'serializer':>14}{'hand-rolled':>14}{'speedup':>9}")
+    for item, (serializer, hand_rolled) in results.items():
+        print(f"{item:<18}{serializer:>11.2f} us{hand_rolled:>11.2f} us{serializer / hand_rolled:>8.1f}x")
+    print(f"(customers with {PRODUCTS_PER_CUSTOMER} favorite products each)")
@@ -0,0 +1,49 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from django.conf import settings
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def set_read_from_replica(enabled: bool) -> Token:
+    return _read_from_replica.set(enabled)
+
+
+def reset_read_from_replica(token: Token):
+    _read_from_replica.reset(token)
+
+
+@contextmanager
+def read_from_replica(enabled: bool = True):
+    token = set_read_from_replica(enabled)
+    try:
+        yield
+    finally:
+        reset_read_from_replica(token)
+
+
+class ReplicaRouter:
+    # Reads go to a random replica only inside read_from_replica(); everything else, and every write, goes to the
+    # primary. Replicas get their schema from the primary, so migrations never run against them.
+
+    @staticmethod
+    def db_for_read(model, **hints):
+        if _read_from_replica.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    @staticmethod
+    def db_for_write(model, **hints):
+        return "default"
+
+    @staticmethod
+    def allow_relation(obj1, obj2, **hints):
+        return True
+
+    @staticmethod
+    def allow_migrate(db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,30 @@
+import multiprocessing
+import os
+
+# gthread runs the WSGI app on a thread pool per worker; uvicorn runs the ASGI app, which the async views need to
+# overlap catalog I/O on one event loop per worker.
+WORKER_CLASSES = {
+    "gthread": ("gthread", "config.wsgi:application"),
+    "uvicorn": ("uvicorn_worker.UvicornWorker", "config.asgi:application"),
+}
+cpu_count = multiprocessing.cpu_count()
+worker_type = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+worker_class, wsgi_app = WORKER_CLASSES[worker_type]
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+# Threaded workers spend most of a request waiting on Postgres, Redis or the catalog, so oversubscribe the CPUs; an
+# event loop worker is CPU bound and gets one per core.
+workers = int(os.getenv("GUNICORN_WORKERS", 2 * cpu_count + 1 if worker_type == "gthread" else cpu_count))
+# Threads are per worker, and the worker count already scales with the CPUs. Each thread may hold a database
+# connection, so a fixed count keeps every worker within its connection pool (POSTGRES_POOL_MAX_SIZE) on any machine.
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+# Import Django once in the master and fork, so workers start fast and share the loaded code pages.
+preload_app = True
+# Recycle workers after a jittered number of requests, so slow leaks never build up and workers restart one by one.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# An empty GUNICORN_ACCESSLOG turns the access log off.
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None
@@ -12,6 +12,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
 ]
 THIRD_PARTY_APPS = [
+    "adrf",
     "corsheaders",
     "drf_spectacular",
     "rest_framework",
@@ -50,6 +51,21 @@ TEMPLATES = [
     },
 ]
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
+POSTGRES_POOL = os.getenv("POSTGRES_POOL", "false").lower() == "true"
+POSTGRES_OPTIONS = {}
+if POSTGRES_POOL:
+    POSTGRES_OPTIONS["pool"] = {
+        "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+    }
+# Persistent connections are only the default for the WSGI workers. Under ASGI each sync_to_async ORM call runs on an
+# executor thread that opens its own connection, and Django only closes old connections on the thread that handles
+# request_finished, so persistent ones pile up idle. The uvicorn profile closes them per request unless
+# POSTGRES_CONN_MAX_AGE says otherwise; POSTGRES_POOL is the way to reuse connections there.
+ASGI_SERVER = os.getenv("GUNICORN_WORKER_CLASS", "gthread") == "uvicorn"
+POSTGRES_CONN_MAX_AGE = int(os.getenv("POSTGRES_CONN_MAX_AGE", "0" if ASGI_SERVER else "60"))
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -58,8 +74,20 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # The pool hands connections back itself and cannot be combined with persistent connections.
+        "CONN_MAX_AGE": 0 if POSTGRES_POOL else POSTGRES_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": os.getenv("POSTGRES_CONN_HEALTH_CHECKS", "true").lower() == "true",
+        "OPTIONS": POSTGRES_OPTIONS,
     }
 }
+DATABASE_REPLICAS = {
+    f"replica_{index}": {**DATABASES["default"], "HOST": host}
+    for index, host in enumerate(filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1)
+}
+DATABASES.update(DATABASE_REPLICAS)
+DATABASE_REPLICAS = list(DATABASE_REPLICAS)
+DATABASE_ROUTERS = ["config.db_routers.ReplicaRouter"]
+REPLICA_PIN_TIMEOUT = int(os.getenv("REPLICA_PIN_TIMEOUT", "5"))
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -69,6 +97,54 @@ CACHES = {
         },
     }
 }
+CATALOG_API = {
+    "BASE_URL": os.getenv("CATALOG_API_URL", "http://challenge-api.luizalabs.com/api/product/"),
+    "CONNECT_TIMEOUT": float(os.getenv("CATALOG_API_CONNECT_TIMEOUT", "0.5")),
+    "READ_TIMEOUT": float(os.getenv("CATALOG_API_READ_TIMEOUT", "2")),
+    "MAX_RETRIES": int(os.getenv("CATALOG_API_MAX_RETRIES", "2")),
+    "BACKOFF_FACTOR": float(os.getenv("CATALOG_API_BACKOFF_FACTOR", "0.1")),
+    "BACKOFF_MAX": float(os.getenv("CATALOG_API_BACKOFF_MAX", "1")),
+    "POOL_MAXSIZE": int(os.getenv("CATALOG_API_POOL_MAXSIZE", "20")),
+    "MAX_CONCURRENCY": int(os.getenv("CATALOG_API_MAX_CONCURRENCY", "10")),
+    "CIRCUIT_BREAKER_FAILURE_THRESHOLD": int(os.getenv("CATALOG_API_CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")),
+    "CIRCUIT_BREAKER_RESET_TIMEOUT": float(os.getenv("CATALOG_API_CIRCUIT_BREAKER_RESET_TIMEOUT", "30")),
+    "SINGLE_FLIGHT_LOCK_TIMEOUT": float(os.getenv("CATALOG_API_SINGLE_FLIGHT_LOCK_TIMEOUT", "10")),
+    "SINGLE_FLIGHT_WAIT_TIMEOUT": float(os.getenv("CATALOG_API_SINGLE_FLIGHT_WAIT_TIMEOUT", "10")),
+}
+CATALOG_SYNC = {
+    "CONCURRENCY": int(os.getenv("CATALOG_SYNC_CONCURRENCY", "4")),
+    "RATE_LIMIT": float(os.getenv("CATALOG_SYNC_RATE_LIMIT", "10")),
+}
+PRODUCT_REFRESH = {
+    "MAX_AGE": int(os.getenv("PRODUCT_REFRESH_MAX_AGE", "86400")),
+    "BATCH_SIZE": int(os.getenv("PRODUCT_REFRESH_BATCH_SIZE", "100")),
+    "CONCURRENCY": int(os.getenv("PRODUCT_REFRESH_CONCURRENCY", "10")),
+}
+PRODUCT_OUTBOX = {
+    "BATCH_SIZE": int(os.getenv("PRODUCT_OUTBOX_BATCH_SIZE", "100")),
+    "CONCURRENCY": int(os.getenv("PRODUCT_OUTBOX_CONCURRENCY", "10")),
+    "RETRY_BACKOFF": float(os.getenv("PRODUCT_OUTBOX_RETRY_BACKOFF", "5")),
+    "RETRY_BACKOFF_MAX": float(os.getenv("PRODUCT_OUTBOX_RETRY_BACKOFF_MAX", "300")),
+    "LEASE_TIMEOUT": float(os.getenv("PRODUCT_OUTBOX_LEASE_TIMEOUT", "300")),
+}
+PRODUCT_CACHE = {
+    "TIMEOUT": int(os.getenv("PRODUCT_CACHE_TIMEOUT", "3600")),
+    "STALE_TIMEOUT": int(os.getenv("PRODUCT_CACHE_STALE_TIMEOUT", "600")),
+    "NOT_FOUND_TIMEOUT": int(os.getenv("PRODUCT_CACHE_NOT_FOUND_TIMEOUT", "60")),
+}
+PRODUCT_LOCAL_CACHE = {
+    "ENABLED": os.getenv("PRODUCT_LOCAL_CACHE_ENABLED", "false").lower() == "true",
+    "MAX_SIZE": int(os.getenv("PRODUCT_LOCAL_CACHE_MAX_SIZE", "10000")),
+    "TIMEOUT": float(os.getenv("PRODUCT_LOCAL_CACHE_TIMEOUT", "30")),
+    "INVALIDATION_CHANNEL": os.getenv("PRODUCT_LOCAL_CACHE_INVALIDATION_CHANNEL", "product-cache-invalidation"),
+}
+CUSTOMER_CACHE_TIMEOUT = int(os.getenv("CUSTOMER_CACHE_TIMEOUT", "3600"))
+CUSTOMER_IMPORT_CHUNK_SIZE = int(os.getenv("CUSTOMER_IMPORT_CHUNK_SIZE", "1000"))
+CUSTOMER_EXPORT_CHUNK_SIZE = int(os.getenv("CUSTOMER_EXPORT_CHUNK_SIZE", "2000"))
+FAVORITES_ASYNC_CATALOG_RESOLUTION = os.getenv("FAVORITES_ASYNC_CATALOG_RESOLUTION", "false").lower() == "true"
+FAVORITES_BULK_MAX_ITEMS = int(os.getenv("FAVORITES_BULK_MAX_ITEMS", "200"))
+FAVORITES_CACHE_TIMEOUT = int(os.getenv("FAVORITES_CACHE_TIMEOUT", "3600"))
+FAVORITES_STREAM_CHUNK_SIZE = int(os.getenv("FAVORITES_STREAM_CHUNK_SIZE", "500"))
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -98,6 +174,16 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "v1.common.pagination.IdCursorPagination",
+    "DEFAULT_RENDERER_CLASSES": [
+        "v1.common.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "v1.common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
@@ -139,6 +225,4 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 CORS_URLS_REGEX = r"^api/.*$"
-CORS_ALLOWED_ORIGINS = [
-    "http://challenge-api.luizalabs.com"
-]
+CORS_ALLOWED_ORIGINS = ["http://challenge-api.luizalabs.com"]
@@ -0,0 +1,14 @@
+import os
+
+from config.settings.base import *  # noqa
+
+DEBUG = False
+# No fallback to the development key in base: a deploy without DJANGO_SECRET_KEY fails to start instead.
+SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+SIMPLE_JWT = {**SIMPLE_JWT, "SIGNING_KEY": SECRET_KEY}  # noqa: F405
+ALLOWED_HOSTS = [host for host in os.getenv("DJANGO_ALLOWED_HOSTS", "").split(",") if host]
+CSRF_TRUSTED_ORIGINS = [origin for origin in os.getenv("DJANGO_CSRF_TRUSTED_ORIGINS", "").split(",") if origin]
+# TLS terminates at the proxy in front of gunicorn.
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+SESSION_COOKIE_SECURE = os.getenv("DJANGO_SECURE_COOKIES", "true").lower() == "true"
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
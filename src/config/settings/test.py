@@ -0,0 +1,6 @@
+from config.settings.local import *  # noqa
+from config.settings.local import DATABASES
+
+# A stand-in replica on the test database itself. Routing to it is off unless a test lists it in DATABASE_REPLICAS.
+DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+DATABASE_REPLICAS = []
@@ -5,6 +5,7 @@ from rest_framework.test import APIClient
 
 from v1.customers.tests.factories import CustomerFactory
 from v1.favorites.tests.factories import ProductFactory
+from v1.favorites.tests.fake_catalog import FakeCatalogServer
 from v1.users.tests.factories import CustomUserFactory
 
 register(CustomerFactory)
@@ -45,3 +46,10 @@ def product():
 @pytest.fixture(autouse=True)
 def clear_cache():
     cache.clear()
+
+
+@pytest.fixture
+def fake_catalog(settings):
+    with FakeCatalogServer() as server:
+        settings.CATALOG_API = {**settings.CATALOG_API, "BASE_URL": server.base_url}
+        yield server
@@ -0,0 +1,107 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+
+class LRUCache:
+    def __init__(self, max_size: int, timeout: float):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys) -> dict:
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, mapping: dict):
+        expires_at = time.monotonic() + self.timeout
+        with self._lock:
+            for key, value in mapping.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        self.delete_many([key])
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def publish_invalidation(channel: str, keys, sender: str = ""):
+    # One message per batch: the sender's listener id on the first line, then one key per line.
+    get_redis_connection("default").publish(channel, "\n".join([sender, *keys]))
+
+
+class InvalidationListener(threading.Thread):
+    # Drops keys published on a Redis channel from a local cache. The subscription is made before the thread starts,
+    # so nothing cached after construction can miss an invalidation; after a disconnect the whole cache is cleared.
+    # Messages published with this listener's id as sender are skipped: the publisher already updated its own cache.
+    def __init__(self, channel: str, local_cache: LRUCache, poll_timeout: float = 1):
+        super().__init__(name=f"invalidation-listener:{channel}", daemon=True)
+        self.channel = channel
+        self.local_cache = local_cache
+        self.poll_timeout = poll_timeout
+        self.id = uuid.uuid4().hex
+        self._stopped = threading.Event()
+        self._pubsub = self._subscribe()
+
+    def _subscribe(self):
+        pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        return pubsub
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self._subscribe()
+                message = self._pubsub.get_message(timeout=self.poll_timeout)
+            except RedisError:
+                self._pubsub = None
+                self.local_cache.clear()
+                self._stopped.wait(self.poll_timeout)
+                continue
+            if message is not None:
+                sender, *keys = message["data"].decode().split("\n")
+                if sender != self.id:
+                    self.local_cache.delete_many(keys)
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+    def stop(self):
+        self._stopped.set()
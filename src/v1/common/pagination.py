@@ -0,0 +1,56 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class CreatedAtCursorPagination(IdCursorPagination):
+    # DRF positions its cursor on ordering[0] alone and steps over ties with an offset, which skips rows when paging
+    # back across a bulk add (its rows share the transaction's created_at). The position here is the whole
+    # (created_at, id) key, so it is unique and DRF never needs an offset.
+    ordering = ("created_at", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor = self.decode_cursor(request)
+        if self.position is not None:
+            queryset = queryset.filter(self._after(self.position, reverse=cursor.reverse))
+
+        page = super().paginate_queryset(queryset, request, view)
+        if page is not None and self.position is not None:
+            if cursor.reverse:
+                self.has_next, self.next_position = True, self.position
+            else:
+                self.has_previous, self.previous_position = True, self.position
+        return page
+
+    def decode_cursor(self, request):
+        # The key is filtered on in paginate_queryset; DRF's own created_at filter must not see it.
+        cursor = super().decode_cursor(request)
+        self.position = None if cursor is None else cursor.position
+        return cursor if self.position is None else cursor._replace(position=None)
+
+    @classmethod
+    def _after(cls, position, reverse):
+        created_at, _, id_ = position.rpartition(",")
+        try:
+            created_at = parse_datetime(created_at)
+        except ValueError:
+            created_at = None
+        if created_at is None or not id_.isdigit():
+            raise NotFound(cls.invalid_cursor_message)
+        if reverse:
+            return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=id_)
+        return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=id_)
+
+    @classmethod
+    def _get_position_from_instance(cls, instance, ordering):
+        if isinstance(instance, dict):
+            return f"{instance['created_at'].isoformat()},{instance['id']}"
+        return f"{instance.created_at.isoformat()},{instance.id}"
@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# UTC datetimes end in "Z", as DRF's DateTimeField and JSONEncoder render them.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_drf_encoder = JSONEncoder()
+
+
+def orjson_default(obj):
+    # Called only for types orjson does not serialize natively. Decimals keep their exact digits as strings, like
+    # DRF's DecimalField; everything else (lazy strings, timedeltas, querysets, ...) is handled as DRF's encoder does.
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return _drf_encoder.default(obj)
+
+
+def orjson_dumps(data, option: int = 0) -> bytes:
+    return orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS | option)
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    @classmethod
+    def render(cls, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        option = 0
+        # orjson only indents by two spaces, so any requested indent gets two.
+        if accepted_media_type and "indent=" in accepted_media_type:
+            option = orjson.OPT_INDENT_2
+        # These are valid JSON but not valid JavaScript; escape them as DRF's JSONRenderer does.
+        return orjson_dumps(data, option).replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+
+from config.db_routers import read_from_replica, reset_read_from_replica, set_read_from_replica
+
+
+def _pin_key(key: str) -> str:
+    return f"primary-pin:{key}"
+
+
+def user_pin_key(user) -> str:
+    return f"user:{user.pk}"
+
+
+def pin_to_primary(*keys: str):
+    # Sends reads of these keys to the primary for a while, so writers read their own writes and caches are never
+    # refilled from a replica that has not caught up yet.
+    if settings.DATABASE_REPLICAS and keys:
+        cache.set_many({_pin_key(key): True for key in keys}, timeout=settings.REPLICA_PIN_TIMEOUT)
+
+
+def is_pinned_to_primary(*keys: str) -> bool:
+    return bool(cache.get_many([_pin_key(key) for key in keys]))
+
+
+def _stream_reading_from_replica(content, enabled: bool):
+    # A streaming body runs its queries after the view has returned, one chunk at a time.
+    iterator = iter(content)
+    while True:
+        with read_from_replica(enabled):
+            chunk = next(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class ReplicaReadMixin:
+    # Serves safe requests from a read replica unless one of replica_pin_keys() was written to within the last
+    # REPLICA_PIN_TIMEOUT seconds. A successful unsafe request pins the user who made it.
+
+    @classmethod
+    def replica_pin_keys(cls, request) -> list[str]:
+        return [user_pin_key(request.user)]
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica = (
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in SAFE_METHODS
+            and not is_pinned_to_primary(*self.replica_pin_keys(request))
+        )
+        self._use_replica = use_replica
+        self._replica_token = set_read_from_replica(use_replica)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        replica_token = getattr(self, "_replica_token", None)
+        if replica_token is not None:
+            self._replica_token = None
+            reset_read_from_replica(replica_token)
+            if response.streaming and not response.is_async:
+                response.streaming_content = _stream_reading_from_replica(response.streaming_content, self._use_replica)
+        if request.method not in SAFE_METHODS and status.is_success(response.status_code):
+            pin_to_primary(*self.replica_pin_keys(request))
+        return response
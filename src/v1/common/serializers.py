@@ -0,0 +1,51 @@
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _query_param_set(query_params, name: str) -> set[str] | None:
+    value = query_params.get(name)
+    if value is None:
+        return None
+    return {field for field in value.split(",") if field}
+
+
+class DynamicFieldsMixin:
+    # Sparse fieldsets driven by the ?fields=, ?exclude= and ?expand= query params (?include= is an alias for
+    # ?expand=), or by the same keyword arguments. Nested relations listed in Meta.expandable_fields keep rendering
+    # by default; once ?expand= is given, only the ones it names are rendered.
+
+    def __init__(self, *args, fields=None, exclude=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        # Only reads are shaped by the query params: on writes, dropping a field would also skip its validation.
+        if request is not None and request.method in SAFE_METHODS:
+            requested_fields, requested_exclude, requested_expand = self.field_selection(request.query_params)
+            fields = requested_fields if fields is None else fields
+            exclude = requested_exclude if exclude is None else exclude
+            expand = requested_expand if expand is None else expand
+
+        for name in list(self.fields):
+            if not self.is_field_rendered(name, fields, exclude, expand):
+                self.fields.pop(name)
+
+    @staticmethod
+    def field_selection(query_params) -> tuple[set[str] | None, set[str] | None, set[str] | None]:
+        expand = _query_param_set(query_params, "expand")
+        if expand is None:
+            expand = _query_param_set(query_params, "include")
+        return _query_param_set(query_params, "fields"), _query_param_set(query_params, "exclude"), expand
+
+    @classmethod
+    def is_field_rendered(cls, name: str, fields=None, exclude=None, expand=None) -> bool:
+        if exclude and name in exclude:
+            return False
+        if fields is not None:
+            return name in fields
+        if expand is not None and name in getattr(cls.Meta, "expandable_fields", ()):
+            return name in expand
+        return True
+
+    @classmethod
+    def expanded_fields(cls, request) -> set[str]:
+        # The expandable relations a request will render, for views to prune their select/prefetch_related.
+        selection = cls.field_selection(request.query_params)
+        return {name for name in getattr(cls.Meta, "expandable_fields", ()) if cls.is_field_rendered(name, *selection)}
@@ -0,0 +1,14 @@
+from v1.common.renderers import orjson_dumps
+
+
+def stream_json_array(items, batch_size=100):
+    batch = [b"["]
+    for index, item in enumerate(items):
+        if index:
+            batch.append(b",")
+        batch.append(orjson_dumps(item))
+        if len(batch) >= batch_size:
+            yield b"".join(batch)
+            batch = []
+    batch.append(b"]")
+    yield b"".join(batch)
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from v1.common.local_cache import InvalidationListener, LRUCache, publish_invalidation
+
+CHANNEL = "test-invalidation"
+
+
+def _wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Condition not met in time.")
+        time.sleep(0.01)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    local_cache = LRUCache(max_size=2, timeout=60)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    local_cache.get("a")
+
+    local_cache.set("c", 3)
+
+    assert local_cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_lru_cache_expires_entries():
+    local_cache = LRUCache(max_size=2, timeout=0)
+    local_cache.set("a", 1)
+
+    assert local_cache.get("a") is None
+    assert len(local_cache) == 0
+
+
+def test_invalidation_listener_drops_published_keys():
+    local_cache = LRUCache(max_size=10, timeout=60)
+    local_cache.set_many({"a": "dropped", "b": "kept"})
+    listener = InvalidationListener(CHANNEL, local_cache, poll_timeout=0.1)
+    listener.start()
+    try:
+        publish_invalidation(CHANNEL, ["a"])
+
+        _wait_until(lambda: local_cache.get("a") is None)
+        assert local_cache.get("b") == "kept"
+    finally:
+        listener.stop()
+        listener.join()
+
+
+def test_invalidation_listener_drops_a_batch_but_skips_its_own_messages():
+    local_cache = LRUCache(max_size=10, timeout=60)
+    local_cache.set_many({"a": "dropped", "b": "dropped", "c": "own"})
+    listener = InvalidationListener(CHANNEL, local_cache, poll_timeout=0.1)
+    listener.start()
+    try:
+        publish_invalidation(CHANNEL, ["c"], sender=listener.id)
+        publish_invalidation(CHANNEL, ["a", "b"])
+
+        _wait_until(lambda: local_cache.get("a") is None and local_cache.get("b") is None)
+        assert local_cache.get("c") == "own"
+    finally:
+        listener.stop()
+        listener.join()
@@ -0,0 +1,74 @@
+import io
+import json
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+
+from v1.common.parsers import ORJSONParser
+from v1.common.renderers import ORJSONRenderer
+from v1.common.streaming import stream_json_array
+
+
+def test_renderer_matches_drf_json_renderer():
+    data = {
+        "id": 1,
+        "title": "Caneca ação  ",
+        "price": "1999.90",
+        "review_score": None,
+        "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=UTC),
+        "errors": {"email": [ErrorDetail("This field is required.", code="required")]},
+        "nested": [{"a": 1.5, "b": True}],
+    }
+
+    assert ORJSONRenderer.render(data) == JSONRenderer().render(data)
+
+
+def test_renderer_types():
+    data = {
+        "price": Decimal("10.10"),
+        "naive": datetime(2024, 5, 1, 12, 30),
+        "aware": datetime(2024, 5, 1, 12, 30, tzinfo=UTC),
+        "lazy": gettext_lazy("Not found."),
+        "duration": timedelta(minutes=1),
+        1: "non-string key",
+    }
+
+    assert json.loads(ORJSONRenderer.render(data)) == {
+        "price": "10.10",
+        "naive": "2024-05-01T12:30:00",
+        "aware": "2024-05-01T12:30:00Z",
+        "lazy": "Not found.",
+        "duration": "60.0",
+        "1": "non-string key",
+    }
+
+
+def test_renderer_empty_and_indented():
+    assert ORJSONRenderer.render(None) == b""
+    assert ORJSONRenderer.render({"a": 1}, "application/json; indent=4") == b'{\n  "a": 1\n}'
+
+
+def test_stream_json_array_matches_renderer():
+    items = [{"price": Decimal("5.00"), "title": f"Product {index}"} for index in range(250)]
+
+    assert b"".join(stream_json_array(items)) == ORJSONRenderer.render(items)
+
+
+def test_parser():
+    assert ORJSONParser.parse(io.BytesIO(b'{"product_id": 1, "title": "a\xc3\xa7\xc3\xa3o"}')) == {
+        "product_id": 1,
+        "title": "ação",
+    }
+    assert ORJSONParser.parse(
+        io.BytesIO('{"title": "ação"}'.encode("latin-1")), parser_context={"encoding": "latin-1"}
+    ) == {"title": "ação"}
+
+
+@pytest.mark.parametrize("body", [b"{", b"NaN", b"\xff"])
+def test_parser_invalid_body(body):
+    with pytest.raises(ParseError):
+        ORJSONParser.parse(io.BytesIO(body))
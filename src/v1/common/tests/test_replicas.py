@@ -0,0 +1,190 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from config.db_routers import ReplicaRouter, read_from_replica
+from v1.customers.models import Customer
+from v1.customers.tests.factories import CustomerFactory, CustomerWithProductsFactory
+from v1.favorites.models import FavoriteProduct
+from v1.favorites.tests.factories import ProductFactory
+from v1.users.tests.factories import CustomUserFactory
+
+# The replica alias mirrors the test database over its own connection, so data has to be committed to be seen there.
+replica_db = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+
+
+@pytest.fixture
+def other_client():
+    api_client = APIClient()
+    api_client.force_authenticate(user=CustomUserFactory())
+    return api_client
+
+
+def _get(api_client, url, params=None):
+    with (
+        CaptureQueriesContext(connections["default"]) as primary,
+        CaptureQueriesContext(connections["replica"]) as replica,
+    ):
+        response = api_client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    # Which databases served the request.
+    return response, bool(primary), bool(replica)
+
+
+@pytest.mark.usefixtures("replicas")
+def test_router_reads_from_replica_only_when_asked():
+    router = ReplicaRouter()
+
+    assert router.db_for_read(Customer) is None
+    with read_from_replica():
+        assert router.db_for_read(Customer) == "replica"
+        assert router.db_for_write(Customer) == "default"
+    assert router.allow_migrate("replica", "customers") is False
+    assert router.allow_migrate("default", "customers") is None
+
+
+def test_router_without_replicas_reads_from_primary():
+    with read_from_replica():
+        assert ReplicaRouter().db_for_read(Customer) is None
+
+
+@replica_db
+@pytest.mark.usefixtures("replicas")
+def test_favorite_inserts_go_to_primary_while_reading_from_replica():
+    customer = CustomerFactory()
+    products = ProductFactory.create_batch(2)
+
+    with read_from_replica(), CaptureQueriesContext(connections["replica"]) as replica:
+        assert FavoriteProduct.objects.add_product(customer.id, products[0].id)
+        assert FavoriteProduct.objects.add_products(customer.id, [products[1].id]) == {products[1].id}
+
+    assert not replica
+    assert FavoriteProduct.objects.filter(favorite_id=customer.id).count() == len(products)
+
+
+@replica_db
+@pytest.mark.usefixtures("replicas")
+def test_customer_list_reads_from_replica(api_user_authenticated):
+    CustomerFactory()
+
+    response, primary, replica = _get(api_user_authenticated, reverse("customer_list_create"))
+
+    assert len(response.data["results"]) == 1
+    assert (primary, replica) == (False, True)
+
+
+@replica_db
+@pytest.mark.usefixtures("replicas")
+def test_writer_reads_own_writes_from_primary(api_user_authenticated, other_client):
+    response = api_user_authenticated.post(reverse("customer_list_create"), {"name": "Ana", "email": "ana@example.com"})
+    assert response.status_code == status.HTTP_201_CREATED
+
+    _, primary, replica = _get(api_user_authenticated, reverse("customer_list_create"))
+    assert (primary, replica) == (True, False)
+    _, primary, replica = _get(other_client, reverse("customer_list_create"))
+    assert (primary, replica) == (False, True)
+
+
+def _delete_favorite(api_client, url_name):
+    product = ProductFactory()
+    customer = CustomerWithProductsFactory(favorite=[product])
+    return api_client.delete(reverse(url_name, args=[customer.id, product.id]))
+
+
+WRITES = {
+    "delete favorite": lambda api_client: _delete_favorite(api_client, "delete_favorite_product"),
+    "async delete favorite": lambda api_client: _delete_favorite(api_client, "async_delete_favorite_product"),
+    "async add favorite": lambda api_client: api_client.post(
+        reverse("async_add_favorite_product", args=[CustomerFactory().id]), {"product_id": ProductFactory().id}
+    ),
+    "bulk add favorites": lambda api_client: api_client.post(
+        reverse("bulk_add_favorite_products", args=[CustomerFactory().id]),
+        {"product_ids": [ProductFactory().id]},
+        format="json",
+    ),
+    "import customers": lambda api_client: api_client.generic(
+        "POST", reverse("customer_import"), "name,email\nAna,ana@example.com\n", content_type="text/csv"
+    ),
+    "update user": lambda api_client: api_client.patch(reverse("user_retrieve_update_destroy"), {"email": "new@x.com"}),
+}
+
+
+@replica_db
+@pytest.mark.usefixtures("replicas")
+@pytest.mark.parametrize("write", WRITES.values(), ids=WRITES.keys())
+def test_every_write_pins_the_writer_to_primary(api_user_authenticated, other_client, write):
+    response = write(api_user_authenticated)
+    assert status.is_success(response.status_code)
+
+    # The writer's next customer list, and the favorites in it, must not come from a lagging replica.
+    _, primary, replica = _get(api_user_authenticated, reverse("customer_list_create"))
+    assert (primary, replica) == (True, False)
+    _, primary, replica = _get(other_client, reverse("customer_list_create"))
+    assert (primary, replica) == (False, True)
+
+
+@replica_db
+@pytest.mark.usefixtures("replicas")
+def test_streamed_favorites_read_from_replica(other_client):
+    product = ProductFactory()
+    customer = CustomerWithProductsFactory(favorite=[product])
+    # As if the pin from adding the favorite had expired.
+    cache.clear()
+    url = reverse("add_favorite_product", kwargs={"customer_id": customer.id})
+
+    with (
+        CaptureQueriesContext(connections["default"]) as primary,
+        CaptureQueriesContext(connections["replica"]) as replica,
+    ):
+        response = other_client.get(url, {"stream": "true"})
+        content = b"".join(response.streaming_content)
+
+    # The rows are queried while the body streams, after the view has returned.
+    assert [item["title"] for item in json.loads(content)] == [product.title]
+    assert (bool(primary), bool(replica)) == (False, True)
+
+
+@replica_db
+@pytest.mark.usefixtures("replicas")
+def test_favorites_read_from_primary_after_the_customer_changes(api_user_authenticated, other_client):
+    customer = CustomerFactory()
+    product = ProductFactory()
+    url = reverse("add_favorite_product", kwargs={"customer_id": customer.id})
+
+    _, primary, replica = _get(other_client, url)
+    assert (primary, replica) == (False, True)
+
+    api_user_authenticated.post(url, {"product_id": product.id})
+
+    # Another client is pinned too, so the favorites cache is refilled from the primary and not a lagging replica.
+    response, primary, replica = _get(other_client, url)
+    assert [item["title"] for item in response.data] == [product.title]
+    assert (primary, replica) == (True, False)
+
+
+@replica_db
+@pytest.mark.usefixtures("replicas")
+def test_customer_detail_reads_from_primary_after_an_update(api_user_authenticated, other_client):
+    customer = CustomerFactory()
+    url = reverse("customer_retrieve_update_destroy")
+
+    _, primary, replica = _get(other_client, url, {"email": customer.email})
+    assert (primary, replica) == (False, True)
+
+    customer.name = "Renamed"
+    customer.save()
+
+    response, primary, replica = _get(other_client, url, {"email": customer.email})
+    assert response.data["name"] == "Renamed"
+    assert (primary, replica) == (True, False)
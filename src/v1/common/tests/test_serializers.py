@@ -0,0 +1,55 @@
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from v1.customers.serializers import CustomerSerializer
+from v1.favorites.serializers import ProductSerializer
+
+
+def _request(query_string=""):
+    return Request(APIRequestFactory().get(f"/?{query_string}"))
+
+
+@pytest.mark.django_db
+def test_dynamic_fields_keyword_arguments(customer):
+    assert set(CustomerSerializer(customer, fields={"id", "email"}).data) == {"id", "email"}
+    assert set(CustomerSerializer(customer, exclude={"favorite"}).data) == {"id", "name", "email"}
+    assert set(CustomerSerializer(customer, expand=set()).data) == {"id", "name", "email"}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("query_string", "expected_fields"),
+    [
+        ("", {"id", "name", "email", "favorite"}),
+        ("fields=id,email", {"id", "email"}),
+        ("fields=id,favorite", {"id", "favorite"}),
+        ("exclude=name", {"id", "email", "favorite"}),
+        ("expand=", {"id", "name", "email"}),
+        ("expand=favorite", {"id", "name", "email", "favorite"}),
+        ("include=", {"id", "name", "email"}),
+    ],
+)
+def test_dynamic_fields_query_params(customer, query_string, expected_fields):
+    request = _request(query_string)
+
+    assert set(CustomerSerializer(customer, context={"request": request}).data) == expected_fields
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("review_score", [None, 4])
+def test_product_serializer_sparse_fields_without_review_score(product, review_score):
+    product.review_score = review_score
+
+    assert set(ProductSerializer(product, fields={"id", "title"}).data) == {"id", "title"}
+    assert set(ProductSerializer(product, exclude={"review_score"}).data) == {"id", "title", "image", "price", "link"}
+    request = _request("exclude=review_score")
+    assert "review_score" not in ProductSerializer(product, context={"request": request}).data
+
+
+@pytest.mark.parametrize(
+    ("query_string", "expanded_fields"),
+    [("", {"favorite"}), ("fields=id", set()), ("expand=", set()), ("exclude=favorite", set())],
+)
+def test_expanded_fields(query_string, expanded_fields):
+    assert CustomerSerializer.expanded_fields(_request(query_string)) == expanded_fields
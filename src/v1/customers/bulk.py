@@ -0,0 +1,126 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from v1.customers.models import Customer
+from v1.favorites.models import Favorite
+
+CUSTOMER_FILE_FORMATS = ("csv", "ndjson")
+CUSTOMER_EXPORT_FIELDS = ("id", "name", "email")
+CUSTOMER_FILE_CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+class CustomerImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = ("name", "email")
+        # Uniqueness is checked once per chunk instead of once per row.
+        extra_kwargs = {"email": {"validators": []}}
+
+
+class _Echo:
+    @staticmethod
+    def write(value):
+        return value
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def file_format_from_name(name: str) -> str | None:
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def read_customer_rows(lines, file_format: str):
+    # Yields one item per data row: a dict, or None for an NDJSON line that is not a JSON object.
+    if file_format == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+def _create_customers(customers_data: list[dict]):
+    customers = [Customer(**customer_data) for customer_data in customers_data]
+    with transaction.atomic():
+        Customer.objects.bulk_create(customers)
+        Favorite.objects.bulk_create([Favorite(customer=customer) for customer in customers])
+
+
+def _import_chunk(numbered_rows, report: dict):
+    valid = {}
+    for number, row in numbered_rows:
+        if row is None:
+            report["errors"].append({"row": number, "errors": {"non_field_errors": ["Invalid JSON object."]}})
+            continue
+        serializer = CustomerImportSerializer(data=row)
+        if not serializer.is_valid():
+            report["errors"].append({"row": number, "errors": serializer.errors})
+            continue
+        email = serializer.validated_data["email"]
+        if email in valid:
+            report["errors"].append({"row": number, "errors": {"email": ["Duplicate email in this import."]}})
+            continue
+        valid[email] = (number, serializer.validated_data)
+
+    for email in Customer.objects.filter(email__in=valid).values_list("email", flat=True):
+        number, _ = valid.pop(email)
+        report["errors"].append({"row": number, "errors": {"email": ["customer with this email already exists."]}})
+    if not valid:
+        return
+
+    try:
+        _create_customers([customer_data for _, customer_data in valid.values()])
+    except IntegrityError:
+        # Someone else created one of the emails since the check; retry this chunk row by row.
+        for number, customer_data in valid.values():
+            try:
+                Customer.objects.create(**customer_data)
+            except IntegrityError:
+                report["errors"].append({
+                    "row": number,
+                    "errors": {"email": ["customer with this email already exists."]},
+                })
+            else:
+                report["created"] += 1
+        return
+    report["created"] += len(valid)
+
+
+def import_customers(rows, chunk_size: int) -> dict:
+    # Creates customers and their favorites in bulk, one transaction per chunk. Rows are numbered from 1, in input
+    # order, and invalid ones are reported instead of aborting the import.
+    report = {"created": 0, "errors": []}
+    for chunk in _chunks(enumerate(rows, start=1), chunk_size):
+        _import_chunk(chunk, report)
+    report["errors"].sort(key=lambda error: error["row"])
+    return report
+
+
+def export_customers(file_format: str, chunk_size: int):
+    # iterator() reads through a server-side cursor, so memory stays flat however many customers there are.
+    rows = Customer.objects.order_by("id").values_list(*CUSTOMER_EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    if file_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(CUSTOMER_EXPORT_FIELDS)
+        for chunk in _chunks(rows, chunk_size):
+            yield "".join(writer.writerow(row) for row in chunk)
+        return
+    for chunk in _chunks(rows, chunk_size):
+        yield "".join(json.dumps(dict(zip(CUSTOMER_EXPORT_FIELDS, row))) + "\n" for row in chunk)
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from v1.common.replicas import pin_to_primary
+
+CUSTOMER_FIELDS = ("id", "name", "email")
+
+
+def _customer_email_key(email: str) -> str:
+    return f"customer-email:{email}"
+
+
+def customer_pin_key(email: str) -> str:
+    return _customer_email_key(email)
+
+
+def get_cached_customer(email: str) -> dict | None:
+    return cache.get(_customer_email_key(email))
+
+
+def set_cached_customer(customer_data: dict):
+    cache.set(_customer_email_key(customer_data["email"]), customer_data, timeout=settings.CUSTOMER_CACHE_TIMEOUT)
+
+
+def _delete_cached_customers(emails):
+    cache.delete_many([_customer_email_key(email) for email in emails])
+
+
+def invalidate_cached_customer(*emails: str):
+    emails = {email for email in emails if email}
+    if not emails:
+        return
+    _delete_cached_customers(emails)
+    pin_to_primary(*(customer_pin_key(email) for email in emails))
+    # A reader could re-cache the pre-commit row between the delete and the commit.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _delete_cached_customers(emails))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from v1.customers.bulk import CUSTOMER_FILE_FORMATS, export_customers, file_format_from_name
+
+
+class Command(BaseCommand):
+    help = "Stream every customer out as CSV or NDJSON."
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("--output", default="-", help="Output file, or - for stdout.")
+        parser.add_argument("--file-format", choices=CUSTOMER_FILE_FORMATS)
+        parser.add_argument("--chunk-size", type=int, default=settings.CUSTOMER_EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        file_format = options["file_format"] or file_format_from_name(output)
+        if file_format is None:
+            if output != "-":
+                raise CommandError("Cannot tell the file format from the path; pass --file-format.")
+            file_format = "csv"
+
+        chunks = export_customers(file_format, options["chunk_size"])
+        if output == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(output, "w", encoding="utf-8", newline="") as file:
+            file.writelines(chunks)
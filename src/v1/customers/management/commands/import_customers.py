@@ -0,0 +1,33 @@
+import json
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from v1.customers.bulk import CUSTOMER_FILE_FORMATS, file_format_from_name, import_customers, read_customer_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import customers from a CSV or NDJSON file."
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("path", help="Input file, or - for stdin.")
+        parser.add_argument("--file-format", choices=CUSTOMER_FILE_FORMATS)
+        parser.add_argument("--chunk-size", type=int, default=settings.CUSTOMER_IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or file_format_from_name(path)
+        if file_format is None:
+            raise CommandError("Cannot tell the file format from the path; pass --file-format.")
+
+        if path == "-":
+            report = import_customers(read_customer_rows(sys.stdin, file_format), options["chunk_size"])
+        else:
+            with open(path, encoding="utf-8", newline="") as lines:
+                report = import_customers(read_customer_rows(lines, file_format), options["chunk_size"])
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(f"Created {report['created']} customers, {len(report['errors'])} errors."))
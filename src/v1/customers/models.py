@@ -1,13 +1,35 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from v1.customers.caches import invalidate_cached_customer
 
 
 class Customer(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True, db_index=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so a changed email can be dropped from the lookup cache too.
+        instance._loaded_email = instance.__dict__.get("email")
+        return instance
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
         from v1.favorites.models import Favorite
 
-        if not hasattr(self, "favorite"):
-            Favorite.objects.get_or_create(customer=self)
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            Favorite.objects.create(customer=self)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def invalidate_customer_on_change(sender, instance, created=False, **kwargs):
+    if not created:
+        invalidate_cached_customer(instance.email, getattr(instance, "_loaded_email", None))
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 
+from v1.common.serializers import DynamicFieldsMixin
 from v1.customers.models import Customer
+from v1.favorites.models import Favorite
 from v1.favorites.serializers import FavoriteSerializer
 
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     favorite = FavoriteSerializer(read_only=True)
 
     class Meta:
@@ -15,3 +17,28 @@ class CustomerSerializer(serializers.ModelSerializer):
             "email",
             "favorite",
         )
+        expandable_fields = ("favorite",)
+
+
+def _favorite_representation(customer: Customer, favorite_products: dict[int, list]) -> dict | None:
+    try:
+        favorite_id = customer.favorite.pk
+    except Favorite.DoesNotExist:
+        return None
+    return {"id": favorite_id, "favorite_products": favorite_products.get(favorite_id, [])}
+
+
+def customer_representations(customers, fields, favorite_products: dict[int, list] | None = None) -> list[dict]:
+    # CustomerSerializer's output by attribute access. fields are the rendered field names, in Meta.fields order;
+    # favorite_products maps favorite ids to their already rendered favorite_products lists.
+    favorite_products = favorite_products or {}
+    representations = []
+    for customer in customers:
+        data = {}
+        for name in fields:
+            if name == "favorite":
+                data[name] = _favorite_representation(customer, favorite_products)
+            else:
+                data[name] = getattr(customer, name)
+        representations.append(data)
+    return representations
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from v1.customers.bulk import export_customers, import_customers, read_customer_rows
+from v1.customers.models import Customer
+from v1.customers.tests.factories import CustomerFactory
+from v1.favorites.models import Favorite
+
+CSV_INPUT = """name,email
+Ana,ana@example.com
+,no-name@example.com
+Bruno,not-an-email
+Ana Again,ana@example.com
+Carla,carla@example.com
+"""
+
+
+@pytest.mark.django_db
+def test_import_customers_reports_row_errors():
+    existing = CustomerFactory(email="carla@example.com")
+
+    report = import_customers(read_customer_rows(CSV_INPUT.splitlines(keepends=True), "csv"), chunk_size=2)
+
+    assert report["created"] == 1
+    assert [error["row"] for error in report["errors"]] == [2, 3, 4, 5]
+    assert set(report["errors"][0]["errors"]) == {"name"}
+    assert set(report["errors"][1]["errors"]) == {"email"}
+    assert report["errors"][3]["errors"] == {"email": ["customer with this email already exists."]}
+    customer = Customer.objects.get(email="ana@example.com")
+    assert Favorite.objects.filter(customer=customer).exists()
+    assert Customer.objects.exclude(id=existing.id).count() == 1
+
+
+@pytest.mark.django_db
+def test_import_customers_ndjson():
+    lines = ['{"name": "Ana", "email": "ana@example.com"}\n', "\n", "not json\n", "[1]\n"]
+
+    report = import_customers(read_customer_rows(lines, "ndjson"), chunk_size=100)
+
+    assert report["created"] == 1
+    assert [error["row"] for error in report["errors"]] == [2, 3]
+
+
+@pytest.mark.django_db
+def test_import_customers_queries_per_chunk(django_assert_max_num_queries):
+    rows = [{"name": f"Customer {index}", "email": f"customer{index}@example.com"} for index in range(500)]
+
+    # Per chunk: the existing-email check, a savepoint pair and one INSERT each for customers and favorites.
+    with django_assert_max_num_queries(5 * 5):
+        report = import_customers(rows, chunk_size=100)
+
+    assert report == {"created": len(rows), "errors": []}
+    assert Favorite.objects.count() == len(rows)
+
+
+@pytest.mark.django_db
+def test_export_customers():
+    customers = CustomerFactory.create_batch(3)
+
+    csv_output = "".join(export_customers("csv", chunk_size=2)).splitlines()
+    ndjson_output = [json.loads(line) for line in "".join(export_customers("ndjson", chunk_size=2)).splitlines()]
+
+    assert csv_output[0] == "id,name,email"
+    assert csv_output[1:] == [f"{customer.id},{customer.name},{customer.email}" for customer in customers]
+    assert ndjson_output == [
+        {"id": customer.id, "name": customer.name, "email": customer.email} for customer in customers
+    ]
+
+
+@pytest.mark.django_db
+def test_import_endpoint(api_user_authenticated):
+    response = api_user_authenticated.generic(
+        "POST", reverse("customer_import"), CSV_INPUT.encode(), content_type="text/csv"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [error["row"] for error in response.data["errors"]] == [2, 3, 4]
+    assert set(Customer.objects.values_list("email", flat=True)) == {"ana@example.com", "carla@example.com"}
+
+
+@pytest.mark.django_db
+def test_import_endpoint_requires_a_known_format(api_user_authenticated):
+    response = api_user_authenticated.generic("POST", reverse("customer_import"), b"", content_type="text/plain")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "file_format" in response.data
+
+
+@pytest.mark.django_db
+def test_export_endpoint(api_user_authenticated):
+    customer = CustomerFactory()
+
+    response = api_user_authenticated.get(reverse("customer_export"), {"file_format": "ndjson"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert json.loads(b"".join(response.streaming_content)) == {
+        "id": customer.id,
+        "name": customer.name,
+        "email": customer.email,
+    }
+
+
+@pytest.mark.django_db
+def test_import_and_export_commands(tmp_path):
+    input_path = tmp_path / "customers.csv"
+    input_path.write_text(CSV_INPUT)
+    output_path = tmp_path / "export.ndjson"
+
+    call_command("import_customers", str(input_path))
+    call_command("export_customers", "--output", str(output_path))
+
+    exported = [json.loads(line)["email"] for line in output_path.read_text().splitlines()]
+    assert exported == ["ana@example.com", "carla@example.com"]
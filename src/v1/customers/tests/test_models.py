@@ -19,3 +19,24 @@ def test_favorite_creation_on_customer_save(customer):
 def test_duplicate_email(customer):
     with pytest.raises(IntegrityError):
         Customer.objects.create(name="Test", email=customer.email)
+
+
+@pytest.mark.django_db
+def test_favorite_is_keyed_by_customer(customer):
+    assert customer.favorite.pk == customer.id
+
+
+@pytest.mark.django_db
+def test_customer_update_skips_favorite(customer, django_assert_num_queries):
+    customer.name = "Updated"
+
+    with django_assert_num_queries(1):
+        customer.save()
+
+
+@pytest.mark.django_db
+def test_failed_customer_insert_creates_no_favorite(customer):
+    with pytest.raises(IntegrityError):
+        Customer.objects.create(name="Test", email=customer.email)
+
+    assert Favorite.objects.count() == 1
@@ -1,6 +1,11 @@
 import pytest
+from rest_framework.renderers import JSONRenderer
 
-from v1.customers.serializers import CustomerSerializer
+from v1.customers.models import Customer
+from v1.customers.serializers import CustomerSerializer, customer_representations
+from v1.customers.tests.factories import CustomerWithProductsFactory
+from v1.favorites.models import Favorite
+from v1.favorites.serializers import FavoriteSerializer
 
 
 @pytest.mark.django_db
@@ -34,3 +39,19 @@ def test_customer_serializer_successful_validation():
     assert serializer.is_valid()
     assert serializer.validated_data["name"] == "Valid Client"
     assert serializer.validated_data["email"] == "test@example.com"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("fields", [("id", "name", "email", "favorite"), ("id", "email"), ("favorite",)])
+def test_customer_representations_match_serializer(fields):
+    CustomerWithProductsFactory()
+    Customer.objects.bulk_create([Customer(name="Sem Favoritos", email="sem@example.com")])
+    customers = Customer.objects.select_related("favorite").order_by("id")
+    favorite_products = {
+        favorite.pk: FavoriteSerializer(favorite).data["favorite_products"] for favorite in Favorite.objects.all()
+    }
+
+    expected = CustomerSerializer(customers, many=True, fields=set(fields)).data
+    actual = customer_representations(customers, fields, favorite_products)
+
+    assert JSONRenderer().render(actual) == JSONRenderer().render(expected)
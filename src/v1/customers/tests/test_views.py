@@ -1,9 +1,18 @@
+import json
+
 import pytest
+from django.db.models import Prefetch
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.reverse import reverse
 
+from v1.common.renderers import ORJSONRenderer
 from v1.customers.models import Customer
-from v1.customers.tests.factories import CustomerFactory
+from v1.customers.serializers import CustomerSerializer
+from v1.customers.tests.factories import CustomerFactory, CustomerWithProductsFactory
+from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.tests.factories import FavoriteProductFactory
 
 
 @pytest.mark.django_db
@@ -26,7 +35,54 @@ def test_list_customers(api_user_authenticated):
     response = api_user_authenticated.get(reverse("customer_list_create"))
     assert response.status_code == status.HTTP_200_OK
     number_of_customers = 2
-    assert len(response.data) == number_of_customers
+    assert len(response.data["results"]) == number_of_customers
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("number_of_customers", [1, 10, 30])
+def test_list_customers_query_count_is_constant(api_user_authenticated, number_of_customers, django_assert_num_queries):
+    CustomerWithProductsFactory.create_batch(number_of_customers)
+
+    with django_assert_num_queries(2):
+        response = api_user_authenticated.get(reverse("customer_list_create"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == number_of_customers
+    number_of_products = 5
+    assert all(
+        len(customer["favorite"]["favorite_products"]) == number_of_products for customer in response.data["results"]
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", [{}, {"fields": "id,favorite"}, {"exclude": "favorite"}, {"expand": "favorite"}])
+def test_list_customers_matches_serializer(api_user_authenticated, query):
+    customers = CustomerWithProductsFactory.create_batch(3)
+    FavoriteProductFactory(favorite=customers[0].favorite, product__status=Product.Status.PENDING)
+
+    response = api_user_authenticated.get(reverse("customer_list_create"), query)
+
+    customers = Customer.objects.order_by("id").prefetch_related(
+        Prefetch(
+            "favorite__favoriteproduct_set",
+            queryset=FavoriteProduct.objects.listed().select_related("product").order_by("created_at", "id"),
+        )
+    )
+    serializer = CustomerSerializer(customers, many=True, context={"request": Request(response.wsgi_request)})
+    expected = {"next": None, "previous": None, "results": serializer.data}
+    assert response.content == ORJSONRenderer.render(expected)
+
+
+@pytest.mark.django_db
+def test_list_customers_is_paginated(api_user_authenticated):
+    customers = CustomerFactory.create_batch(3)
+
+    response = api_user_authenticated.get(reverse("customer_list_create"), {"page_size": 2})
+    assert [customer["id"] for customer in response.data["results"]] == [customer.id for customer in customers[:2]]
+
+    response = api_user_authenticated.get(response.data["next"])
+    assert [customer["id"] for customer in response.data["results"]] == [customers[2].id]
+    assert response.data["next"] is None
 
 
 @pytest.mark.django_db
@@ -64,9 +120,130 @@ def test_update_customer(customer, api_user_authenticated):
     assert customer.name == "Updated Customer"
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("method", ["patch", "put"])
+def test_update_customer_hides_pending_products(api_user_authenticated, method):
+    customer = CustomerWithProductsFactory()
+    FavoriteProductFactory(favorite=customer.favorite, product__status=Product.Status.PENDING)
+    url = _detail_url(customer.email)
+
+    response = getattr(api_user_authenticated, method)(
+        url, {"name": "Updated Customer", "email": customer.email}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    expected = api_user_authenticated.get(url).data["favorite"]
+    assert response.data["favorite"] == expected
+    assert len(expected["favorite_products"]) == customer.favorite.favoriteproduct_set.listed().count()
+
+
+@pytest.mark.django_db
+def test_update_customer_malformed_json(customer, api_user_authenticated):
+    url = f"{reverse('customer_retrieve_update_destroy')}?email={customer.email}"
+    response = api_user_authenticated.patch(url, '{"name": ', content_type="application/json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"].startswith("JSON parse error")
+
+
+@pytest.mark.django_db
+def test_create_customer_ignores_sparse_fields(api_user_authenticated):
+    url = f"{reverse('customer_list_create')}?fields=id"
+
+    response = api_user_authenticated.post(url, {"name": "New Customer", "email": "test@example.com"})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert Customer.objects.get().name == "New Customer"
+
+    response = api_user_authenticated.post(url, {"name": "Another Customer", "email": "test@example.com"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "email" in response.data
+
+    response = api_user_authenticated.post(url, {})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {"name", "email"}
+
+
+@pytest.mark.django_db
+def test_update_customer_ignores_sparse_fields(customer, api_user_authenticated):
+    url = f"{_detail_url(customer.email)}&fields=id"
+
+    response = api_user_authenticated.patch(url, {"email": "not-an-email"}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "email" in response.data
+
+    response = api_user_authenticated.patch(url, {"name": "Updated Customer"}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    customer.refresh_from_db()
+    assert customer.name == "Updated Customer"
+
+
 @pytest.mark.django_db
 def test_delete_customer(customer, api_user_authenticated):
     url = f"{reverse('customer_retrieve_update_destroy')}?email={customer.email}"
     response = api_user_authenticated.delete(url)
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert Customer.objects.filter(email=customer.email).count() == 0
+
+
+def _detail_url(email):
+    return f"{reverse('customer_retrieve_update_destroy')}?email={email}"
+
+
+@pytest.mark.django_db
+def test_retrieve_customer_matches_serializer(api_user_authenticated):
+    customer = CustomerWithProductsFactory()
+
+    response = api_user_authenticated.get(reverse("customer_retrieve_update_destroy"), {"email": customer.email})
+
+    assert response.json() == json.loads(JSONRenderer().render(CustomerSerializer(customer).data))
+
+
+@pytest.mark.django_db
+def test_retrieve_customer_is_cached(api_user_authenticated, django_assert_num_queries):
+    customer = CustomerWithProductsFactory()
+    api_user_authenticated.get(_detail_url(customer.email))
+
+    with django_assert_num_queries(1):
+        response = api_user_authenticated.get(_detail_url(customer.email))
+    assert len(response.data["favorite"]["favorite_products"]) == len(customer.favorite.products.all())
+
+    with django_assert_num_queries(0):
+        response = api_user_authenticated.get(f"{_detail_url(customer.email)}&include=")
+    assert response.data == {"id": customer.id, "name": customer.name, "email": customer.email}
+
+
+@pytest.mark.django_db
+def test_updating_customer_email_invalidates_cache(customer, api_user_authenticated):
+    old_email = customer.email
+    api_user_authenticated.get(_detail_url(old_email))
+
+    api_user_authenticated.patch(_detail_url(old_email), {"email": "new@example.com"}, format="json")
+
+    assert api_user_authenticated.get(_detail_url(old_email)).status_code == status.HTTP_404_NOT_FOUND
+    assert api_user_authenticated.get(_detail_url("new@example.com")).data["id"] == customer.id
+
+
+@pytest.mark.django_db
+def test_deleting_customer_invalidates_cache(customer, api_user_authenticated):
+    api_user_authenticated.get(_detail_url(customer.email))
+
+    api_user_authenticated.delete(_detail_url(customer.email))
+
+    assert api_user_authenticated.get(_detail_url(customer.email)).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_list_customers_sparse_fields_skip_favorites(api_user_authenticated, django_assert_num_queries):
+    CustomerWithProductsFactory.create_batch(3)
+
+    with django_assert_num_queries(1):
+        response = api_user_authenticated.get(reverse("customer_list_create"), {"fields": "id,email"})
+
+    assert all(set(customer) == {"id", "email"} for customer in response.data["results"])
+
+
+@pytest.mark.django_db
+def test_retrieve_customer_sparse_fields(customer, api_user_authenticated):
+    response = api_user_authenticated.get(f"{_detail_url(customer.email)}&fields=id,favorite")
+
+    assert set(response.data) == {"id", "favorite"}
+    assert response.data["favorite"]["id"] == customer.id
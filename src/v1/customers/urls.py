@@ -1,8 +1,15 @@
 from django.urls import path
 
-from v1.customers.views import CustomerListCreate, CustomerRetrieveUpdateDestroy
+from v1.customers.views import (
+    CustomerExportView,
+    CustomerImportView,
+    CustomerListCreate,
+    CustomerRetrieveUpdateDestroy,
+)
 
 urlpatterns = [
     path("", CustomerListCreate.as_view(), name="customer_list_create"),
     path("detail/", CustomerRetrieveUpdateDestroy.as_view(), name="customer_retrieve_update_destroy"),
+    path("import/", CustomerImportView.as_view(), name="customer_import"),
+    path("export/", CustomerExportView.as_view(), name="customer_export"),
 ]
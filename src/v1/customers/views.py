@@ -1,27 +1,161 @@
-from rest_framework.exceptions import NotFound
+import codecs
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from v1.common.replicas import ReplicaReadMixin
+from v1.customers.bulk import (
+    CUSTOMER_FILE_CONTENT_TYPES,
+    CUSTOMER_FILE_FORMATS,
+    export_customers,
+    import_customers,
+    read_customer_rows,
+)
+from v1.customers.caches import CUSTOMER_FIELDS, customer_pin_key, get_cached_customer, set_cached_customer
 from v1.customers.models import Customer
-from v1.customers.serializers import CustomerSerializer
+from v1.customers.serializers import CustomerSerializer, customer_representations
+from v1.favorites.models import FavoriteProduct
+from v1.favorites.serializers import PRODUCT_REPRESENTATION_FIELDS, product_row_representation
+
+
+def customer_data_by_email(email):
+    customer_data = get_cached_customer(email)
+    if customer_data is None:
+        customer_data = Customer.objects.filter(email=email).values(*CUSTOMER_FIELDS).first()
+        if customer_data is not None:
+            set_cached_customer(customer_data)
+    return customer_data
+
+
+def customer_file_format(request, default=None):
+    # file_format rather than format, which DRF reserves for content negotiation.
+    file_format = request.query_params.get("file_format", default)
+    if file_format is None:
+        content_type = request.content_type.split(";")[0].strip()
+        file_format = next((key for key, value in CUSTOMER_FILE_CONTENT_TYPES.items() if value == content_type), None)
+    if file_format not in CUSTOMER_FILE_FORMATS:
+        raise ValidationError({"file_format": [f"Must be one of: {', '.join(CUSTOMER_FILE_FORMATS)}."]})
+    return file_format
+
+
+def favorite_products_data(customer_ids) -> dict[int, list]:
+    # FavoriteSerializer's favorite_products for each customer, from a single values_list() query. Favorites are
+    # keyed by customer id.
+    rows = (
+        FavoriteProduct.objects.listed()
+        .filter(favorite_id__in=customer_ids)
+        .order_by("created_at", "id")
+        .values_list("favorite_id", *(f"product__{field}" for field in PRODUCT_REPRESENTATION_FIELDS))
+    )
+    favorite_products = {customer_id: [] for customer_id in customer_ids}
+    for favorite_id, *product_row in rows:
+        favorite_products[favorite_id].append({"product": product_row_representation(product_row)})
+    return favorite_products
 
 
-class CustomerListCreate(ListCreateAPIView):
+def favorite_data(customer_id):
+    # Same shape as FavoriteSerializer.
+    return {"id": customer_id, "favorite_products": favorite_products_data([customer_id])[customer_id]}
+
+
+class CustomerListCreate(ReplicaReadMixin, ListCreateAPIView):
     serializer_class = CustomerSerializer
     permission_classes = (IsAuthenticated,)
     queryset = Customer.objects.all()
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Only join the favorite when the response will render it.
+        if "favorite" in CustomerSerializer.expanded_fields(self.request):
+            queryset = queryset.select_related("favorite")
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        # Renders the page without a serializer per customer and per product; the output is CustomerSerializer's.
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        customers = list(queryset) if page is None else page
+
+        selection = CustomerSerializer.field_selection(request.query_params)
+        fields = [
+            name for name in CustomerSerializer.Meta.fields if CustomerSerializer.is_field_rendered(name, *selection)
+        ]
+        favorite_products = None
+        if "favorite" in fields:
+            favorite_products = favorite_products_data([customer.id for customer in customers])
+        data = customer_representations(customers, fields, favorite_products)
 
-class CustomerRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView):
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class CustomerRetrieveUpdateDestroy(ReplicaReadMixin, RetrieveUpdateDestroyAPIView):
     serializer_class = CustomerSerializer
     permission_classes = (IsAuthenticated,)
     queryset = Customer.objects.all()
 
-    def get_object(self):
+    @classmethod
+    def replica_pin_keys(cls, request):
+        keys = super().replica_pin_keys(request)
+        email = request.query_params.get("email")
+        if email:
+            keys.append(customer_pin_key(email))
+        return keys
+
+    def get_email(self):
         email = self.request.query_params.get("email")
         if not email:
             raise NotFound(detail="Error: email query parameter is required")
+        return email
+
+    def get_object(self):
         try:
-            return Customer.objects.get(email=email)
+            return Customer.objects.get(email=self.get_email())
         except Customer.DoesNotExist:
             raise NotFound(detail="Error: Customer with this email not found")
+
+    def retrieve(self, request, *args, **kwargs):
+        customer_data = customer_data_by_email(self.get_email())
+        if customer_data is None:
+            raise NotFound(detail="Error: Customer with this email not found")
+
+        selection = CustomerSerializer.field_selection(request.query_params)
+        data = {
+            name: value
+            for name, value in customer_data.items()
+            if CustomerSerializer.is_field_rendered(name, *selection)
+        }
+        if CustomerSerializer.is_field_rendered("favorite", *selection):
+            data["favorite"] = favorite_data(customer_data["id"])
+        return Response(data)
+
+
+class CustomerImportView(ReplicaReadMixin, APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @classmethod
+    def post(cls, request):
+        file_format = customer_file_format(request)
+        # The body is read line by line rather than parsed into request.data, so large files are never held whole.
+        lines = codecs.iterdecode(request.stream or [], "utf-8")
+        report = import_customers(read_customer_rows(lines, file_format), settings.CUSTOMER_IMPORT_CHUNK_SIZE)
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class CustomerExportView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @classmethod
+    def get(cls, request):
+        file_format = customer_file_format(request, default="csv")
+        return StreamingHttpResponse(
+            export_customers(file_format, settings.CUSTOMER_EXPORT_CHUNK_SIZE),
+            content_type=CUSTOMER_FILE_CONTENT_TYPES[file_format],
+        )
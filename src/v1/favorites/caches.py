@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from typing import NamedTuple
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django_redis import get_redis_connection
+
+from v1.common.local_cache import InvalidationListener, LRUCache, publish_invalidation
+from v1.common.replicas import pin_to_primary
+
+PRODUCT_FIELDS = ("title", "image", "price", "review_score", "link")
+PRODUCT_REVALIDATION_TIMEOUT = 10
+
+
+class CachedProduct(NamedTuple):
+    # data is None for products known not to exist.
+    data: dict | None
+    stale: bool
+
+
+def _favorites_key(customer_id: int) -> str:
+    return f"favorites:{customer_id}"
+
+
+def _favorites_version_key(customer_id: int) -> str:
+    return f"favorites:{customer_id}:version"
+
+
+def favorites_pin_key(customer_id: int) -> str:
+    return _favorites_key(customer_id)
+
+
+def get_cached_favorites(customer_id: int) -> tuple[list | None, int]:
+    # Payload and version come back in a single MGET. A payload cached under an older version is stale.
+    key, version_key = _favorites_key(customer_id), _favorites_version_key(customer_id)
+    values = cache.get_many([key, version_key])
+    version = values.get(version_key, 0)
+    cached = values.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1], version
+    return None, version
+
+
+def set_cached_favorites(customer_id: int, version: int, products_data: list):
+    cache.set(_favorites_key(customer_id), (version, products_data), timeout=settings.FAVORITES_CACHE_TIMEOUT)
+
+
+def _bump_favorites_versions(customer_ids):
+    # One pipelined round trip however many customers. INCR starts a missing counter at 1 with no expiry, and
+    # django-redis stores integers unpickled, so cache.get() reads these back as ints.
+    pipeline = get_redis_connection("default").pipeline(transaction=False)
+    for customer_id in customer_ids:
+        pipeline.incr(cache.make_key(_favorites_version_key(customer_id)))
+    pipeline.execute()
+
+
+def invalidate_cached_favorites(*customer_ids: int):
+    customer_ids = set(customer_ids)
+    if not customer_ids:
+        return
+    _bump_favorites_versions(customer_ids)
+    pin_to_primary(*(favorites_pin_key(customer_id) for customer_id in customer_ids))
+    # A reader could rebuild the payload from the pre-commit state between the bump and the commit, so bump once
+    # more after the commit.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_favorites_versions(customer_ids))
+
+
+# Optional in-process tier in front of Redis, one per worker process.
+_local_products = None
+_local_products_listener = None
+_local_products_pid = None
+_local_products_lock = threading.Lock()
+
+
+def _get_local_products() -> LRUCache | None:
+    global _local_products, _local_products_listener, _local_products_pid  # noqa: PLW0603
+    config = settings.PRODUCT_LOCAL_CACHE
+    if not config["ENABLED"]:
+        return None
+    # A forked worker inherits the parent's entries but not its listener thread.
+    if _local_products is None or _local_products_pid != os.getpid():
+        with _local_products_lock:
+            if _local_products is None or _local_products_pid != os.getpid():
+                local_products = LRUCache(config["MAX_SIZE"], config["TIMEOUT"])
+                _local_products_listener = InvalidationListener(config["INVALIDATION_CHANNEL"], local_products)
+                _local_products_listener.start()
+                _local_products, _local_products_pid = local_products, os.getpid()
+    return _local_products
+
+
+@receiver(setting_changed)
+def reset_local_products(setting, **kwargs):
+    global _local_products, _local_products_listener  # noqa: PLW0603
+    if setting == "PRODUCT_LOCAL_CACHE":
+        if _local_products_listener is not None:
+            _local_products_listener.stop()
+        _local_products = _local_products_listener = None
+
+
+def _product_key(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def _encode_product(product_data: dict | None) -> bytes:
+    # Positional orjson array: [fresh_until, title, image, price, review_score, link], or [fresh_until] for a product
+    # the catalog does not know.
+    config = settings.PRODUCT_CACHE
+    if product_data is None:
+        return orjson.dumps([int(time.time()) + config["NOT_FOUND_TIMEOUT"]])
+    return orjson.dumps([int(time.time()) + config["TIMEOUT"], *(product_data[field] for field in PRODUCT_FIELDS)])
+
+
+def _decode_product(product_id: int, raw: bytes) -> CachedProduct:
+    fresh_until, *values = orjson.loads(raw)
+    if not values:
+        return CachedProduct(None, stale=False)
+    return CachedProduct({"id": int(product_id), **dict(zip(PRODUCT_FIELDS, values))}, stale=time.time() >= fresh_until)
+
+
+def _product_timeout(product_data: dict | None) -> int:
+    config = settings.PRODUCT_CACHE
+    if product_data is None:
+        return config["NOT_FOUND_TIMEOUT"]
+    return config["TIMEOUT"] + config["STALE_TIMEOUT"]
+
+
+def get_cached_product(product_id: int) -> CachedProduct | None:
+    return get_cached_products([product_id]).get(product_id)
+
+
+def get_cached_products(product_ids) -> dict[int, CachedProduct]:
+    keys = {_product_key(product_id): product_id for product_id in product_ids}
+    local_products = _get_local_products()
+    values = {} if local_products is None else local_products.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        remote_values = cache.get_many(missing)
+        if local_products is not None:
+            local_products.set_many(remote_values)
+        values.update(remote_values)
+    return {keys[key]: _decode_product(keys[key], raw) for key, raw in values.items()}
+
+
+def set_cached_product(product_id: int, product_data: dict | None):
+    set_cached_products({product_id: product_data})
+
+
+def set_cached_products(products_data: dict[int, dict | None]):
+    found = {product_id: data for product_id, data in products_data.items() if data is not None}
+    not_found = {product_id: None for product_id, data in products_data.items() if data is None}
+    local_products = _get_local_products()
+    for group in (found, not_found):
+        if group:
+            values = {_product_key(product_id): _encode_product(data) for product_id, data in group.items()}
+            cache.set_many(values, timeout=_product_timeout(next(iter(group.values()))))
+            if local_products is not None:
+                local_products.set_many(values)
+    _publish_product_invalidation([_product_key(product_id) for product_id in products_data])
+
+
+def _publish_product_invalidation(keys):
+    # Only deployments with the local tier pay for the PUBLISH; every worker shares that setting.
+    if not keys or not settings.PRODUCT_LOCAL_CACHE["ENABLED"]:
+        return
+    listener = _local_products_listener if _local_products_pid == os.getpid() else None
+    sender = "" if listener is None else listener.id
+    publish_invalidation(settings.PRODUCT_LOCAL_CACHE["INVALIDATION_CHANNEL"], keys, sender=sender)
+
+
+def claim_product_revalidation(product_id: int) -> bool:
+    return cache.add(f"{_product_key(product_id)}:revalidating", True, timeout=PRODUCT_REVALIDATION_TIMEOUT)
+
+
+def _delete_cached_products(product_ids):
+    keys = [_product_key(product_id) for product_id in product_ids]
+    cache.delete_many(keys)
+    local_products = _get_local_products()
+    if local_products is not None:
+        local_products.delete_many(keys)
+    _publish_product_invalidation(keys)
+
+
+def invalidate_cached_product(product_id: int):
+    invalidate_cached_products(product_id)
+
+
+def invalidate_cached_products(*product_ids: int):
+    if not product_ids:
+        return
+    _delete_cached_products(product_ids)
+    # As with favorites, a reader could re-cache the pre-commit row before the commit lands.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _delete_cached_products(product_ids))
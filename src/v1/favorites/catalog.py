@@ -0,0 +1,218 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+from rest_framework import status
+
+
+class CatalogUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: let this request probe the upstream, keep failing fast for the others.
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class RateLimiter:
+    # Spaces calls evenly at no more than `rate` per second across threads.
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate else 0
+        self._next_at = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            scheduled_at = max(now, self._next_at)
+            self._next_at = scheduled_at + self.interval
+        if scheduled_at > now:
+            time.sleep(scheduled_at - now)
+
+
+class CatalogClient:
+    def __init__(self, config: dict, breaker: CircuitBreaker | None = None):
+        self.base_url = config["BASE_URL"]
+        self.timeout = (config["CONNECT_TIMEOUT"], config["READ_TIMEOUT"])
+        self.max_retries = config["MAX_RETRIES"]
+        self.backoff_factor = config["BACKOFF_FACTOR"]
+        self.backoff_max = config["BACKOFF_MAX"]
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=config["CIRCUIT_BREAKER_FAILURE_THRESHOLD"],
+            reset_timeout=config["CIRCUIT_BREAKER_RESET_TIMEOUT"],
+        )
+        self.session = self._create_session(config)
+
+    @staticmethod
+    def _create_session(config: dict) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config["POOL_MAXSIZE"])
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_product(self, product_id: int) -> dict | None:
+        response = self._get(f"{self.base_url}{product_id}/")
+        if response.status_code != status.HTTP_200_OK:
+            return None
+        return response.json()
+
+    def get_page(self, page: int) -> list[dict]:
+        # The catalog answers pages past the last one with a 404.
+        response = self._get(self.base_url, params={"page": page})
+        if response.status_code != status.HTTP_200_OK:
+            return []
+        return response.json()["products"]
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2**attempt))
+
+    @staticmethod
+    def _is_retryable(status_code: int) -> bool:
+        return status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR or status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def _get(self, url: str, params: dict | None = None) -> requests.Response:
+        if not self.breaker.allow_request():
+            raise CatalogUnavailable("Catalog circuit breaker is open.")
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._backoff(attempt - 1))
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as exc:
+                error = exc
+                continue
+            if not self._is_retryable(response.status_code):
+                self.breaker.record_success()
+                return response
+            error = CatalogUnavailable(f"Catalog responded with status {response.status_code}.")
+
+        self.breaker.record_failure()
+        raise CatalogUnavailable(f"Catalog request to {url} failed.") from error
+
+
+class AsyncCatalogClient(CatalogClient):
+    @staticmethod
+    def _create_session(config: dict) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(config["READ_TIMEOUT"], connect=config["CONNECT_TIMEOUT"]),
+            limits=httpx.Limits(
+                max_connections=config["POOL_MAXSIZE"], max_keepalive_connections=config["POOL_MAXSIZE"]
+            ),
+        )
+
+    async def get_product(self, product_id: int) -> dict | None:
+        response = await self._get(f"{self.base_url}{product_id}/")
+        if response.status_code != status.HTTP_200_OK:
+            return None
+        return response.json()
+
+    async def _get(self, url: str, params: dict | None = None) -> httpx.Response:
+        if not self.breaker.allow_request():
+            raise CatalogUnavailable("Catalog circuit breaker is open.")
+
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._backoff(attempt - 1))
+            try:
+                response = await self.session.get(url, params=params)
+            except httpx.HTTPError as exc:
+                error = exc
+                continue
+            if not self._is_retryable(response.status_code):
+                self.breaker.record_success()
+                return response
+            error = CatalogUnavailable(f"Catalog responded with status {response.status_code}.")
+
+        self.breaker.record_failure()
+        raise CatalogUnavailable(f"Catalog request to {url} failed.") from error
+
+
+_client = None
+_client_lock = threading.Lock()
+# httpx.AsyncClient connections are bound to the event loop that opened them, so each loop gets its own client,
+# closed when the loop shuts down. Under ASGI that is one client per worker process; under WSGI every async view
+# runs in a short-lived loop of its own, so the client lives as long as the request.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_catalog_client() -> CatalogClient:
+    global _client  # noqa: PLW0603
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CatalogClient(settings.CATALOG_API)
+    return _client
+
+
+async def _close_on_loop_shutdown(client: AsyncCatalogClient):
+    # Parked until cancelled: asyncio.run() (and so async_to_sync and uvicorn) cancels every pending task before
+    # closing its loop, and reset_catalog_client() cancels it too.
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if _async_clients.get(loop, (None,))[0] is client:
+            del _async_clients[loop]
+        await client.session.aclose()
+
+
+def get_async_catalog_client() -> AsyncCatalogClient:
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        client = AsyncCatalogClient(settings.CATALOG_API, get_catalog_client().breaker)
+        # The task is kept here because the loop only holds weak references to its tasks.
+        entry = _async_clients[loop] = (client, loop.create_task(_close_on_loop_shutdown(client)))
+    return entry[0]
+
+
+@receiver(setting_changed)
+def reset_catalog_client(setting, **kwargs):
+    global _client  # noqa: PLW0603
+    if setting == "CATALOG_API":
+        _client = None
+        for loop, (_, closer) in list(_async_clients.items()):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(closer.cancel)
+        _async_clients.clear()
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from v1.favorites.products import process_product_outbox
+
+
+class Command(BaseCommand):
+    help = "Resolve pending products recorded by favorite adds against the catalog. Runs as a worker with --interval."
+
+    @classmethod
+    def add_arguments(cls, parser):
+        config = settings.PRODUCT_OUTBOX
+        parser.add_argument("--batch-size", type=int, default=config["BATCH_SIZE"])
+        parser.add_argument("--concurrency", type=int, default=config["CONCURRENCY"])
+        parser.add_argument(
+            "--interval", type=float, help="Keep running, polling the outbox every this many seconds once it is empty."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            totals = {"resolved": 0, "unresolvable": 0, "retried": 0}
+            while report := process_product_outbox(options["batch_size"], options["concurrency"]):
+                if not any(report.values()):
+                    break
+                for key, value in report.items():
+                    totals[key] += value
+                # Entries that failed come back after their backoff, so stop instead of spinning on them.
+                if report["retried"] == options["batch_size"]:
+                    break
+            if any(totals.values()):
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Resolved {totals['resolved']} products, {totals['unresolvable']} unresolvable, "
+                        f"{totals['retried']} to retry."
+                    )
+                )
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from v1.favorites.products import refresh_stale_products
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-fetch stale products from the catalog and update the ones that changed. Run it periodically, or as a "
+        "worker with --interval."
+    )
+
+    @classmethod
+    def add_arguments(cls, parser):
+        config = settings.PRODUCT_REFRESH
+        parser.add_argument(
+            "--max-age", type=float, default=config["MAX_AGE"], help="Refresh products checked longer ago, in seconds."
+        )
+        parser.add_argument("--batch-size", type=int, default=config["BATCH_SIZE"])
+        parser.add_argument("--concurrency", type=int, default=config["CONCURRENCY"])
+        parser.add_argument("--limit", type=int, help="Stop after this many products.")
+        parser.add_argument("--interval", type=float, help="Keep running, starting a new pass every this many seconds.")
+
+    def handle(self, *args, **options):
+        while True:
+            started_at = time.monotonic()
+            report = refresh_stale_products(
+                options["max_age"], options["batch_size"], options["concurrency"], options["limit"]
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Checked {report['checked']} products: {report['changed']} changed, {report['missing']} missing "
+                    f"from the catalog, {report['unavailable']} skipped while the catalog was unavailable."
+                )
+            )
+            if options["interval"] is None:
+                return
+            time.sleep(max(0, options["interval"] - (time.monotonic() - started_at)))
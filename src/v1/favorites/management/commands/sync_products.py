@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from v1.favorites.catalog import CatalogUnavailable
+from v1.favorites.products import SYNC_CHECKPOINT_KEY, sync_products
+
+
+class Command(BaseCommand):
+    help = "Copy the catalog into the products table and warm the product cache, resuming from the last checkpoint."
+
+    @classmethod
+    def add_arguments(cls, parser):
+        parser.add_argument("--concurrency", type=int, default=settings.CATALOG_SYNC["CONCURRENCY"])
+        parser.add_argument(
+            "--rate-limit",
+            type=float,
+            default=settings.CATALOG_SYNC["RATE_LIMIT"],
+            help="Maximum catalog pages requested per second; 0 disables the limit.",
+        )
+        parser.add_argument("--start-page", type=int, help="Start from this page instead of the checkpoint.")
+        parser.add_argument("--max-pages", type=int, help="Stop after this many pages.")
+        parser.add_argument("--restart", action="store_true", help="Discard the checkpoint and start from page 1.")
+
+    def handle(self, *args, **options):
+        if options["restart"]:
+            cache.delete(SYNC_CHECKPOINT_KEY)
+        try:
+            report = sync_products(
+                options["concurrency"], options["rate_limit"], options["start_page"], options["max_pages"]
+            )
+        except CatalogUnavailable as exc:
+            raise CommandError(
+                f"{exc} Run the command again to resume from page {cache.get(SYNC_CHECKPOINT_KEY, 1)}."
+            ) from exc
+
+        message = f"Synced {report['products']} products from {report['pages']} pages."
+        if report["next_page"] is not None:
+            message += f" Resume from page {report['next_page']}."
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,40 @@
+from asgiref.sync import sync_to_async
+from django.db import connections, models, router
+
+
+class FavoriteProductManager(models.Manager):
+    def listed(self):
+        # Favorites whose product details are known; placeholders waiting on the catalog stay hidden until resolved.
+        return self.filter(product__status="resolved")
+
+    def _write_connection(self):
+        # self.db routes like a read, which would send these inserts to a replica inside read_from_replica().
+        return connections[self._db or router.db_for_write(self.model)]
+
+    def add_product(self, favorite_id: int, product_id: int) -> bool:
+        # A single round trip that leans on the (favorite, product) unique constraint instead of checking first.
+        # Returns False when the product was already in the favorites.
+        connection = self._write_connection()
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (favorite_id, product_id) VALUES (%s, %s) "
+                "ON CONFLICT (favorite_id, product_id) DO NOTHING RETURNING id",
+                [favorite_id, product_id],
+            )
+            return cursor.fetchone() is not None
+
+    def add_products(self, favorite_id: int, product_ids) -> set[int]:
+        # Bulk counterpart of add_product. Returns the ids actually inserted.
+        connection = self._write_connection()
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (favorite_id, product_id) SELECT %s, unnest(%s::bigint[]) "
+                "ON CONFLICT (favorite_id, product_id) DO NOTHING RETURNING product_id",
+                [favorite_id, list(product_ids)],
+            )
+            return {product_id for (product_id,) in cursor.fetchall()}
+
+    async def aadd_product(self, favorite_id: int, product_id: int) -> bool:
+        return await sync_to_async(self.add_product)(favorite_id, product_id)
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:41
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favorites', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "DELETE FROM favorites_favoriteproduct WHERE favorite_id IS NULL OR product_id IS NULL",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterUniqueTogether(
+            name='favoriteproduct',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='favoriteproduct',
+            name='created_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now()),
+        ),
+        migrations.AlterField(
+            model_name='favoriteproduct',
+            name='favorite',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='favorites.favorite'),
+        ),
+        migrations.AlterField(
+            model_name='favoriteproduct',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='favorites.product'),
+        ),
+        migrations.AddIndex(
+            model_name='favoriteproduct',
+            index=models.Index(fields=['favorite', 'created_at', 'id'], include=('product',), name='favoriteproduct_listing_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='favoriteproduct',
+            constraint=models.UniqueConstraint(fields=('favorite', 'product'), name='favoriteproduct_favorite_product_uniq'),
+        ),
+    ]
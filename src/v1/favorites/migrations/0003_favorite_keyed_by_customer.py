@@ -0,0 +1,96 @@
+# Generated by Django 5.1.2 on 2026-10-18 13:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def key_favorites_by_customer(apps, schema_editor):
+    # Re-points favorite products at the customer id and swaps Favorite's primary key from id to customer_id.
+    connection = schema_editor.connection
+    quote_name = schema_editor.quote_name
+    with connection.cursor() as cursor:
+        favorite_product_constraints = connection.introspection.get_constraints(cursor, "favorites_favoriteproduct")
+        favorite_constraints = connection.introspection.get_constraints(cursor, "favorites_favorite")
+
+    for name, constraint in favorite_product_constraints.items():
+        if constraint["foreign_key"] and constraint["columns"] == ["favorite_id"]:
+            schema_editor.execute(f"ALTER TABLE favorites_favoriteproduct DROP CONSTRAINT {quote_name(name)}")
+
+    # Going through negative ids keeps the (favorite, product) unique constraint satisfied row by row. Deferred FK
+    # checks would otherwise be left pending and block the ALTER TABLEs below.
+    schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    schema_editor.execute(
+        "UPDATE favorites_favoriteproduct AS favorite_product SET favorite_id = -favorite.customer_id "
+        "FROM favorites_favorite AS favorite WHERE favorite_product.favorite_id = favorite.id"
+    )
+    schema_editor.execute("UPDATE favorites_favoriteproduct SET favorite_id = -favorite_id")
+
+    for name, constraint in favorite_constraints.items():
+        if constraint["primary_key"] or (constraint["unique"] and constraint["columns"] == ["customer_id"]):
+            schema_editor.execute(f"ALTER TABLE favorites_favorite DROP CONSTRAINT {quote_name(name)}")
+    schema_editor.execute("ALTER TABLE favorites_favorite DROP COLUMN id")
+    schema_editor.execute("ALTER TABLE favorites_favorite ADD PRIMARY KEY (customer_id)")
+    schema_editor.execute(
+        "ALTER TABLE favorites_favoriteproduct ADD CONSTRAINT favorites_favoriteproduct_favorite_id_fk "
+        "FOREIGN KEY (favorite_id) REFERENCES favorites_favorite (customer_id) DEFERRABLE INITIALLY DEFERRED"
+    )
+
+
+def key_favorites_by_id(apps, schema_editor):
+    # Reverses key_favorites_by_customer: gives Favorite back an identity id primary key and re-points favorite
+    # products at it.
+    connection = schema_editor.connection
+    quote_name = schema_editor.quote_name
+    with connection.cursor() as cursor:
+        favorite_constraints = connection.introspection.get_constraints(cursor, "favorites_favorite")
+
+    schema_editor.execute(
+        "ALTER TABLE favorites_favoriteproduct DROP CONSTRAINT favorites_favoriteproduct_favorite_id_fk"
+    )
+    for name, constraint in favorite_constraints.items():
+        if constraint["primary_key"]:
+            schema_editor.execute(f"ALTER TABLE favorites_favorite DROP CONSTRAINT {quote_name(name)}")
+    schema_editor.execute(
+        "ALTER TABLE favorites_favorite ADD COLUMN id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"
+    )
+    schema_editor.execute(
+        "ALTER TABLE favorites_favorite ADD CONSTRAINT favorites_favorite_customer_id_key UNIQUE (customer_id)"
+    )
+
+    schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    schema_editor.execute(
+        "UPDATE favorites_favoriteproduct AS favorite_product SET favorite_id = -favorite.id "
+        "FROM favorites_favorite AS favorite WHERE favorite_product.favorite_id = favorite.customer_id"
+    )
+    schema_editor.execute("UPDATE favorites_favoriteproduct SET favorite_id = -favorite_id")
+    schema_editor.execute(
+        "ALTER TABLE favorites_favoriteproduct ADD CONSTRAINT favorites_favoriteproduct_favorite_id_fk "
+        "FOREIGN KEY (favorite_id) REFERENCES favorites_favorite (id) DEFERRABLE INITIALLY DEFERRED"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('favorites', '0002_favoriteproduct_constraints'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(key_favorites_by_customer, key_favorites_by_id),
+            ],
+            state_operations=[
+                migrations.RemoveField(
+                    model_name='favorite',
+                    name='id',
+                ),
+                migrations.AlterField(
+                    model_name='favorite',
+                    name='customer',
+                    field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='favorite', serialize=False, to='customers.customer'),
+                ),
+            ],
+        ),
+    ]
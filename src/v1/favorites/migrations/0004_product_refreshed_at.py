@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:06
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favorites', '0003_favorite_keyed_by_customer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='refreshed_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), db_index=True),
+        ),
+    ]
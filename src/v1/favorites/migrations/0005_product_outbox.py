@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-18 14:09
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favorites', '0004_product_refreshed_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductOutbox',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='favorites.product')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('available_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('resolved', 'Resolved'), ('unresolvable', 'Unresolvable')], default='resolved', max_length=16),
+        ),
+    ]
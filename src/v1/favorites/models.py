@@ -1,23 +1,35 @@
-from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.functions import Now
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
 from v1.customers.models import Customer
+from v1.favorites.caches import invalidate_cached_favorites, invalidate_cached_product
+from v1.favorites.managers import FavoriteProductManager
 
 
 class Favorite(models.Model):
-    customer = models.OneToOneField(Customer, on_delete=models.CASCADE, related_name="favorite")
+    # Keyed by the customer itself, so favorite_id == customer_id and reads can skip this table.
+    customer = models.OneToOneField(Customer, on_delete=models.CASCADE, primary_key=True, related_name="favorite")
     products = models.ManyToManyField("Product", through="FavoriteProduct", blank=True)
 
 
 class Product(models.Model):
+    class Status(models.TextChoices):
+        # Pending products are placeholders recorded by a favorite add, waiting for the outbox worker to fetch them.
+        PENDING = "pending"
+        RESOLVED = "resolved"
+        UNRESOLVABLE = "unresolvable"
+
     id = models.BigAutoField(primary_key=True, editable=False)
     title = models.CharField(max_length=255)
     image = models.URLField()
     price = models.DecimalField(max_digits=7, decimal_places=2)
     review_score = models.PositiveSmallIntegerField(blank=True, null=True)
     link = models.CharField(max_length=255)
+    # When the row was last checked against the catalog; the refresher walks this index oldest first.
+    refreshed_at = models.DateTimeField(db_default=Now(), db_index=True)
+    status = models.CharField(max_length=16, choices=Status, default=Status.RESOLVED)
     favorites = models.ManyToManyField("Favorite", through="FavoriteProduct", blank=True)
 
 
@@ -28,14 +40,64 @@ def create_product_link(sender, instance, **kwargs):
 
 
 class FavoriteProduct(models.Model):
-    favorite = models.ForeignKey(Favorite, on_delete=models.SET_NULL, blank=True, null=True)
-    product = models.ForeignKey(Product, on_delete=models.SET_NULL, blank=True, null=True)
+    # The unique constraint's index leads with favorite_id, so the FK needs no index of its own.
+    favorite = models.ForeignKey(Favorite, on_delete=models.CASCADE, db_index=False)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(db_default=Now())
+
+    objects = FavoriteProductManager()
 
     class Meta:
-        unique_together = ["favorite", "product"]
+        constraints = [
+            models.UniqueConstraint(fields=["favorite", "product"], name="favoriteproduct_favorite_product_uniq"),
+        ]
+        indexes = [
+            # Covers the ordered favorites listing without touching the heap for product_id.
+            models.Index(
+                fields=["favorite", "created_at", "id"], include=["product"], name="favoriteproduct_listing_idx"
+            ),
+        ]
+
+
+class ProductOutbox(models.Model):
+    # Transactional outbox for catalog resolution: a row is written in the same transaction as its pending product
+    # and deleted by the worker once the product is resolved or found not to exist.
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(db_default=Now(), db_index=True)
+
+
+def favorite_ids_with_product(product):
+    return FavoriteProduct.objects.filter(product=product).values_list("favorite_id", flat=True)
+
+
+@receiver(post_save, sender=FavoriteProduct)
+@receiver(post_delete, sender=FavoriteProduct)
+def invalidate_favorites_on_favorite_product_change(sender, instance, **kwargs):
+    invalidate_cached_favorites(instance.favorite_id)
+
+
+@receiver(m2m_changed, sender=FavoriteProduct)
+def invalidate_favorites_on_products_change(sender, instance, action, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "pre_clear"}:
+        return
+    if isinstance(instance, Favorite):
+        invalidate_cached_favorites(instance.customer_id)
+    elif action == "pre_clear":
+        invalidate_cached_favorites(*favorite_ids_with_product(instance))
+    else:
+        # Favorites are keyed by customer id.
+        invalidate_cached_favorites(*pk_set)
+
+
+@receiver(post_save, sender=Product)
+@receiver(pre_delete, sender=Product)
+def invalidate_favorites_on_product_change(sender, instance, created=False, **kwargs):
+    invalidate_cached_product(instance.id)
+    if not created:
+        invalidate_cached_favorites(*favorite_ids_with_product(instance))
 
 
-@receiver(pre_save, sender=FavoriteProduct)
-def prevent_duplicate_favorite(sender, instance, **kwargs):
-    if FavoriteProduct.objects.filter(favorite=instance.favorite, product=instance.product).exists():
-        raise ValidationError(f"The product {instance.product.id} is already in the favorites.")
+@receiver(post_delete, sender=Customer)
+def invalidate_favorites_on_customer_delete(sender, instance, **kwargs):
+    invalidate_cached_favorites(instance.id)
@@ -0,0 +1,484 @@
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from redis.exceptions import LockError
+
+from v1.favorites.caches import (
+    claim_product_revalidation,
+    get_cached_product,
+    get_cached_products,
+    invalidate_cached_favorites,
+    invalidate_cached_products,
+    set_cached_product,
+    set_cached_products,
+)
+from v1.favorites.catalog import CatalogUnavailable, RateLimiter, get_async_catalog_client, get_catalog_client
+from v1.favorites.models import FavoriteProduct, Product, ProductOutbox, create_product_link
+
+SYNC_CHECKPOINT_KEY = "catalog-sync:next-page"
+PRODUCT_UPDATE_FIELDS = ("title", "image", "price", "review_score", "link", "refreshed_at", "status")
+PRODUCT_REFRESH_FIELDS = ("title", "image", "price", "review_score")
+PRODUCT_SYNC_FIELDS = (*PRODUCT_REFRESH_FIELDS, "link", "status")
+PRICE_QUANTUM = Decimal("0.01")
+
+# Catalog fetches in flight on each event loop, keyed by product id.
+_inflight_fetches = weakref.WeakKeyDictionary()
+
+
+def _lock_key(product_id: int) -> str:
+    return f"product-fetch-lock:{product_id}"
+
+
+def product_cache_data(product: Product) -> dict:
+    return {
+        "id": product.id,
+        "title": product.title,
+        "image": product.image,
+        "price": str(product.price),
+        "review_score": product.review_score,
+        "link": product.link,
+    }
+
+
+def _product_defaults(product_data: dict) -> dict:
+    return {
+        "title": product_data["title"],
+        "image": product_data["image"],
+        "price": product_data["price"],
+        "review_score": product_data.get("review_score", None),
+    }
+
+
+def _loaded_product(product: Product) -> Product | None:
+    # Caches a row read from the database. Pending placeholders are usable but not cached, so the cache only ever
+    # holds catalog data; unresolvable ones count as not found.
+    if product.status == Product.Status.UNRESOLVABLE:
+        set_cached_product(product.id, None)
+        return None
+    if product.status == Product.Status.RESOLVED:
+        set_cached_product(product.id, product_cache_data(product))
+    return product
+
+
+def _single_flight_lock(product_id: int, **kwargs):
+    config = settings.CATALOG_API
+    return cache.lock(
+        _lock_key(product_id),
+        timeout=config["SINGLE_FLIGHT_LOCK_TIMEOUT"],
+        blocking_timeout=config["SINGLE_FLIGHT_WAIT_TIMEOUT"],
+        **kwargs,
+    )
+
+
+def _release(lock):
+    try:
+        lock.release()
+    except LockError:
+        pass
+
+
+def _known_missing(product_id: int) -> bool:
+    cached = get_cached_product(product_id)
+    return cached is not None and cached.data is None
+
+
+def fetch_product(product_id: int) -> Product | None:
+    # Single flight: callers racing on the same id queue on a Redis lock, and whoever gets it after the first
+    # fetch picks up the result from the database (or the negative cache entry) instead of calling the catalog again.
+    lock = _single_flight_lock(product_id)
+    if not lock.acquire(blocking=True):
+        raise CatalogUnavailable(f"Timed out waiting for the catalog fetch of product {product_id}.")
+
+    try:
+        product = Product.objects.filter(id=product_id).first()
+        if product is None:
+            if _known_missing(product_id):
+                return None
+            product_data = get_catalog_client().get_product(product_id)
+            if product_data is None:
+                set_cached_product(product_id, None)
+                return None
+            product, _ = Product.objects.get_or_create(id=product_data["id"], defaults=_product_defaults(product_data))
+        return _loaded_product(product)
+    finally:
+        _release(lock)
+
+
+def _cached_product(product_id: int) -> tuple[bool, Product | None]:
+    # Serves fresh entries and, while one caller revalidates it from the database, stale ones too.
+    cached = get_cached_product(product_id)
+    if cached is None:
+        return False, None
+    if cached.data is None:
+        return True, None
+    if cached.stale and claim_product_revalidation(product_id):
+        return False, None
+    return True, Product(**cached.data)
+
+
+def get_product(product_id: int) -> Product | None:
+    # Cache, then database, then the catalog. Raises CatalogUnavailable when the catalog cannot be reached.
+    hit, product = _cached_product(product_id)
+    if hit:
+        return product
+    product = Product.objects.filter(id=product_id).first()
+    if product is None:
+        return fetch_product(product_id)
+    return _loaded_product(product)
+
+
+def enqueue_product_resolution(product_id: int) -> Product:
+    # Records a pending placeholder and its outbox entry in one transaction, for process_product_outbox to resolve.
+    with transaction.atomic():
+        product, created = Product.objects.get_or_create(
+            id=product_id, defaults={"title": "", "image": "", "price": 0, "status": Product.Status.PENDING}
+        )
+        if created:
+            ProductOutbox.objects.create(product=product)
+    return product
+
+
+def get_or_enqueue_product(product_id: int) -> Product | None:
+    # get_product without the catalog round trip: a product unknown locally comes back as a pending placeholder.
+    hit, product = _cached_product(product_id)
+    if hit:
+        return product
+    product = Product.objects.filter(id=product_id).first()
+    if product is None:
+        return enqueue_product_resolution(product_id)
+    return _loaded_product(product)
+
+
+def _get_catalog_product(product_id: int) -> dict | None | CatalogUnavailable:
+    try:
+        return get_catalog_client().get_product(product_id)
+    except CatalogUnavailable as exc:
+        return exc
+
+
+def _load_products(product_ids: list[int], products: dict, to_cache: dict):
+    # Same rules as _loaded_product: unresolvable rows are cached as not found, pending ones used but not cached.
+    for product in Product.objects.filter(id__in=product_ids):
+        if product.status == Product.Status.UNRESOLVABLE:
+            to_cache[product.id] = None
+            continue
+        products[product.id] = product
+        if product.status == Product.Status.RESOLVED:
+            to_cache[product.id] = product
+
+
+def resolve_products(product_ids: list[int]) -> tuple[dict[int, Product], set[int]]:
+    # One cache round trip, one query and concurrent catalog fetches for whatever is left. Returns the products
+    # found, keyed by id, and the ids the catalog could not be reached for; ids in neither do not exist. Stale
+    # entries are reloaded by the same query as the misses.
+    products, not_found = {}, set()
+    for product_id, cached in get_cached_products(product_ids).items():
+        if cached.data is None:
+            not_found.add(product_id)
+        elif not cached.stale:
+            products[product_id] = Product(**cached.data)
+
+    to_cache = {}
+    missing = [product_id for product_id in product_ids if product_id not in products and product_id not in not_found]
+    if missing:
+        _load_products(missing, products, to_cache)
+
+    unavailable = set()
+    missing = [product_id for product_id in missing if product_id not in products and product_id not in to_cache]
+    if missing:
+        max_workers = min(len(missing), settings.CATALOG_API["MAX_CONCURRENCY"])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(missing, executor.map(_get_catalog_product, missing)))
+
+        new_products = []
+        for product_id, product_data in results.items():
+            if isinstance(product_data, CatalogUnavailable):
+                unavailable.add(product_id)
+            elif product_data is None:
+                to_cache[product_id] = None
+            else:
+                product = Product(id=product_id, **_product_defaults(product_data))
+                create_product_link(Product, product)
+                new_products.append(product)
+        Product.objects.bulk_create(new_products, ignore_conflicts=True)
+        for product in new_products:
+            products[product.id] = to_cache[product.id] = product
+
+    set_cached_products({
+        product_id: None if product is None else product_cache_data(product) for product_id, product in to_cache.items()
+    })
+    return products, unavailable
+
+
+async def _aacquire(lock) -> bool:
+    # Polls instead of blocking, so waiting for the lock never ties up a thread. The lock is not thread-local:
+    # sync_to_async may acquire and release it from different threads.
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.CATALOG_API["SINGLE_FLIGHT_WAIT_TIMEOUT"]
+    while not await sync_to_async(lock.acquire)(blocking=False):
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(lock.sleep)
+    return True
+
+
+async def _afetch_product(product_id: int) -> Product | None:
+    # fetch_product's cross-process single flight, on the same Redis lock.
+    lock = _single_flight_lock(product_id, thread_local=False)
+    if not await _aacquire(lock):
+        raise CatalogUnavailable(f"Timed out waiting for the catalog fetch of product {product_id}.")
+
+    try:
+        product = await Product.objects.filter(id=product_id).afirst()
+        if product is None:
+            if await sync_to_async(_known_missing)(product_id):
+                return None
+            product_data = await get_async_catalog_client().get_product(product_id)
+            if product_data is None:
+                await sync_to_async(set_cached_product)(product_id, None)
+                return None
+            product, _ = await Product.objects.aget_or_create(
+                id=product_data["id"], defaults=_product_defaults(product_data)
+            )
+        return await sync_to_async(_loaded_product)(product)
+    finally:
+        await sync_to_async(_release)(lock)
+
+
+async def afetch_product(product_id: int) -> Product | None:
+    # Requests on the same event loop share one in-flight catalog fetch per product id; across loops and processes,
+    # the fetch itself is single-flighted on the Redis lock.
+    inflight = _inflight_fetches.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(product_id)
+    if task is None:
+        task = inflight[product_id] = asyncio.ensure_future(_afetch_product(product_id))
+        task.add_done_callback(lambda _: inflight.pop(product_id, None))
+    return await asyncio.shield(task)
+
+
+async def aget_product(product_id: int) -> Product | None:
+    hit, product = await sync_to_async(_cached_product)(product_id)
+    if hit:
+        return product
+    return await afetch_product(product_id)
+
+
+def _catalog_product(product_data: dict, refreshed_at) -> Product:
+    product = Product(id=product_data["id"], refreshed_at=refreshed_at, **_product_defaults(product_data))
+    # Kept as the database would return it, so cached and compared values match loaded rows.
+    product.price = Decimal(str(product.price)).quantize(PRICE_QUANTUM)
+    create_product_link(Product, product)
+    return product
+
+
+def _invalidate_favorites_with_products(product_ids: list[int]):
+    favorite_ids = FavoriteProduct.objects.filter(product_id__in=product_ids)
+    invalidate_cached_favorites(*favorite_ids.values_list("favorite_id", flat=True).distinct())
+
+
+def upsert_products(products_data: list[dict]) -> list[Product]:
+    # Writes the catalog rows that are new or differ from the stored ones with one INSERT ... ON CONFLICT DO UPDATE;
+    # the rest only get their refreshed_at bumped. bulk_create sends no signals, so every synced product is cached
+    # here, which also warms a cold cache from an up-to-date table, and the favorites holding the updated ones are
+    # invalidated in one query. Returns the products written.
+    refreshed_at = timezone.now()
+    products = [_catalog_product(product_data, refreshed_at) for product_data in products_data]
+    stored = Product.objects.only(*PRODUCT_SYNC_FIELDS).in_bulk([product.id for product in products])
+    changed = [
+        product
+        for product in products
+        if product.id not in stored
+        or any(getattr(stored[product.id], field) != getattr(product, field) for field in PRODUCT_SYNC_FIELDS)
+    ]
+    changed_ids = {product.id for product in changed}
+
+    Product.objects.bulk_create(
+        changed, update_conflicts=True, unique_fields=["id"], update_fields=PRODUCT_UPDATE_FIELDS
+    )
+    unchanged_ids = stored.keys() - changed_ids
+    if unchanged_ids:
+        Product.objects.filter(id__in=unchanged_ids).update(refreshed_at=refreshed_at)
+    if products:
+        set_cached_products({product.id: product_cache_data(product) for product in products})
+    # New products are in no favorites yet.
+    updated_ids = changed_ids & stored.keys()
+    if updated_ids:
+        _invalidate_favorites_with_products(list(updated_ids))
+    return changed
+
+
+def _get_catalog_page(rate_limiter: RateLimiter, page: int) -> list[dict] | CatalogUnavailable:
+    rate_limiter.wait()
+    try:
+        return get_catalog_client().get_page(page)
+    except CatalogUnavailable as exc:
+        return exc
+
+
+def sync_products(
+    concurrency: int, rate_limit: float, start_page: int | None = None, max_pages: int | None = None
+) -> dict:
+    # Copies the catalog into Product page by page, fetching `concurrency` pages at a time and at most `rate_limit`
+    # pages per second. Pages are stored in order and the next one is checkpointed in the cache after each, so a run
+    # that fails with CatalogUnavailable resumes where it stopped. The checkpoint is cleared once the last page is in.
+    page = start_page or cache.get(SYNC_CHECKPOINT_KEY, 1)
+    report = {"pages": 0, "products": 0, "next_page": page}
+    rate_limiter = RateLimiter(rate_limit)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while max_pages is None or report["pages"] < max_pages:
+            size = concurrency if max_pages is None else min(concurrency, max_pages - report["pages"])
+            pages = range(page, page + size)
+            for page_number, products_data in zip(pages, executor.map(_get_catalog_page, [rate_limiter] * size, pages)):
+                if isinstance(products_data, CatalogUnavailable):
+                    raise products_data
+                if not products_data:
+                    cache.delete(SYNC_CHECKPOINT_KEY)
+                    report["next_page"] = None
+                    return report
+                upsert_products(products_data)
+                page = page_number + 1
+                cache.set(SYNC_CHECKPOINT_KEY, page, timeout=None)
+                report["pages"] += 1
+                report["products"] += len(products_data)
+                report["next_page"] = page
+    return report
+
+
+def _refresh_batch(products: list[Product], concurrency: int, report: dict):
+    with ThreadPoolExecutor(max_workers=min(len(products), concurrency)) as executor:
+        results = executor.map(_get_catalog_product, [product.id for product in products])
+
+    refreshed_at = timezone.now()
+    changed, checked = [], []
+    for product, product_data in zip(products, results):
+        if isinstance(product_data, CatalogUnavailable):
+            report["unavailable"] += 1
+            continue
+        # Products the catalog no longer knows are kept, since favorites point at them, and checked again later.
+        checked.append(product.id)
+        if product_data is None:
+            report["missing"] += 1
+            continue
+        fresh = _catalog_product(product_data, refreshed_at)
+        if any(getattr(product, field) != getattr(fresh, field) for field in PRODUCT_REFRESH_FIELDS):
+            for field in PRODUCT_REFRESH_FIELDS:
+                setattr(product, field, getattr(fresh, field))
+            product.refreshed_at = refreshed_at
+            changed.append(product)
+
+    Product.objects.bulk_update(changed, [*PRODUCT_REFRESH_FIELDS, "refreshed_at"])
+    unchanged = set(checked) - {product.id for product in changed}
+    Product.objects.filter(id__in=unchanged).update(refreshed_at=refreshed_at)
+    if changed:
+        changed_ids = [product.id for product in changed]
+        invalidate_cached_products(*changed_ids)
+        _invalidate_favorites_with_products(changed_ids)
+    report["checked"] += len(checked)
+    report["changed"] += len(changed)
+
+
+def refresh_stale_products(max_age: float, batch_size: int, concurrency: int, limit: int | None = None) -> dict:
+    # Re-fetches products last checked more than max_age seconds ago, oldest first, batch_size at a time with up to
+    # `concurrency` catalog requests in flight. Rows that changed are written back with one bulk_update per batch and
+    # their cache entries dropped; the rest only get their refreshed_at bumped. Products the catalog could not be
+    # reached for keep their refreshed_at and are skipped over by the keyset, to be retried on the next run.
+    stale_before = timezone.now() - timedelta(seconds=max_age)
+    report = {"checked": 0, "changed": 0, "missing": 0, "unavailable": 0}
+    stale = Product.objects.filter(status=Product.Status.RESOLVED, refreshed_at__lt=stale_before).order_by(
+        "refreshed_at", "id"
+    )
+    last_seen = None
+    while limit is None or report["checked"] + report["unavailable"] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - report["checked"] - report["unavailable"])
+        batch = stale
+        if last_seen is not None:
+            refreshed_at, product_id = last_seen
+            batch = batch.filter(Q(refreshed_at__gt=refreshed_at) | Q(refreshed_at=refreshed_at, id__gt=product_id))
+        products = list(batch.only("id", "refreshed_at", *PRODUCT_REFRESH_FIELDS)[:size])
+        if not products:
+            break
+        last_seen = (products[-1].refreshed_at, products[-1].id)
+        _refresh_batch(products, concurrency, report)
+    return report
+
+
+def _outbox_retry_at(attempts: int, now):
+    config = settings.PRODUCT_OUTBOX
+    return now + timedelta(seconds=min(config["RETRY_BACKOFF_MAX"], config["RETRY_BACKOFF"] * 2 ** (attempts - 1)))
+
+
+def _claim_outbox_entries(batch_size: int) -> tuple[list[ProductOutbox], object]:
+    # A short transaction that leases due entries by pushing their available_at to the end of the lease. Other
+    # workers skip them until it runs out, so no lock is held while the catalog is called; if this worker dies, the
+    # entries come back on their own.
+    now = timezone.now()
+    leased_until = now + timedelta(seconds=settings.PRODUCT_OUTBOX["LEASE_TIMEOUT"])
+    with transaction.atomic():
+        entries = list(
+            ProductOutbox.objects.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now)
+            .order_by("available_at")[:batch_size]
+        )
+        ProductOutbox.objects.filter(product_id__in=[entry.product_id for entry in entries]).update(
+            available_at=leased_until
+        )
+    return entries, leased_until
+
+
+def process_product_outbox(batch_size: int, concurrency: int) -> dict:
+    # Resolves one batch of pending products. Entries are leased in one short transaction, fetched from the catalog
+    # outside any transaction and settled in a second one, so any number of workers can run side by side without
+    # fetching the same product twice or holding locks across network calls. Resolved products get their catalog
+    # data, unknown ones are marked unresolvable and dropped from favorites, and entries the catalog could not be
+    # reached for are retried later with exponential backoff.
+    report = {"resolved": 0, "unresolvable": 0, "retried": 0}
+    entries, leased_until = _claim_outbox_entries(batch_size)
+    if not entries:
+        return report
+
+    with ThreadPoolExecutor(max_workers=min(len(entries), concurrency)) as executor:
+        results = list(executor.map(_get_catalog_product, [entry.product_id for entry in entries]))
+
+    with transaction.atomic():
+        # Entries whose lease ran out meanwhile may have been claimed by another worker; leave them to it.
+        owned = set(
+            ProductOutbox.objects.select_for_update()
+            .filter(product_id__in=[entry.product_id for entry in entries], available_at=leased_until)
+            .values_list("product_id", flat=True)
+        )
+        now = timezone.now()
+        resolved, unresolvable, retried = [], [], []
+        for entry, product_data in zip(entries, results):
+            if entry.product_id not in owned:
+                continue
+            if isinstance(product_data, CatalogUnavailable):
+                entry.attempts += 1
+                entry.available_at = _outbox_retry_at(entry.attempts, now)
+                retried.append(entry)
+            elif product_data is None:
+                unresolvable.append(entry.product_id)
+            else:
+                resolved.append(_catalog_product({**product_data, "id": entry.product_id}, now))
+
+        Product.objects.bulk_update(resolved, PRODUCT_UPDATE_FIELDS)
+        if unresolvable:
+            Product.objects.filter(id__in=unresolvable).update(status=Product.Status.UNRESOLVABLE, refreshed_at=now)
+            FavoriteProduct.objects.filter(product_id__in=unresolvable).delete()
+        ProductOutbox.objects.bulk_update(retried, ["attempts", "available_at"])
+        done = [product.id for product in resolved] + unresolvable
+        ProductOutbox.objects.filter(product_id__in=done).delete()
+        if done:
+            invalidate_cached_products(*done)
+            _invalidate_favorites_with_products([product.id for product in resolved])
+
+    report["resolved"], report["unresolvable"], report["retried"] = len(resolved), len(unresolvable), len(retried)
+    return report
@@ -1,9 +1,12 @@
+from django.conf import settings
+from django.db import models
 from rest_framework import serializers
 
+from v1.common.serializers import DynamicFieldsMixin
 from v1.favorites.models import Favorite, FavoriteProduct, Product
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     review_score = serializers.SerializerMethodField()
 
     class Meta:
@@ -16,20 +19,51 @@ class ProductSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        if representation.get("review_score") is None:
+        if "review_score" in representation and representation["review_score"] is None:
             representation.pop("review_score")
         return representation
 
 
-class FavoriteProductSerializer(serializers.ModelSerializer):
+PRODUCT_REPRESENTATION_FIELDS = ("id", "title", "image", "price", "review_score", "link")
+
+
+def product_row_representation(row) -> dict:
+    # ProductSerializer's output from a tuple of PRODUCT_REPRESENTATION_FIELDS values, without instantiating any
+    # serializer. Prices are two-place Decimals, which format exactly as DRF's DecimalField renders them.
+    product_id, title, image, price, review_score, link = row
+    if review_score is None:
+        return {"id": product_id, "title": title, "image": image, "price": f"{price:.2f}", "link": link}
+    return {
+        "id": product_id,
+        "title": title,
+        "image": image,
+        "price": f"{price:.2f}",
+        "review_score": review_score,
+        "link": link,
+    }
+
+
+class ListedFavoriteProductsSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Pending placeholders stay hidden, in the order the GET paths list them. A prefetched relation is rendered
+        # as is: its Prefetch queryset is expected to be listed() already.
+        if isinstance(data, models.Manager) and data.all()._result_cache is None:
+            data = data.listed().select_related("product").order_by("created_at", "id")
+        return super().to_representation(data)
+
+
+class FavoriteProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product = ProductSerializer()
 
     class Meta:
         model = FavoriteProduct
         fields = ["product"]
+        expandable_fields = ["product"]
+        list_serializer_class = ListedFavoriteProductsSerializer
 
 
-class FavoriteSerializer(serializers.ModelSerializer):
+class FavoriteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source="pk", read_only=True)
     favorite_products = FavoriteProductSerializer(source="favoriteproduct_set", many=True, read_only=True)
 
     class Meta:
@@ -38,3 +72,16 @@ class FavoriteSerializer(serializers.ModelSerializer):
             "id",
             "favorite_products",
         ]
+        expandable_fields = ["favorite_products"]
+
+
+class BulkFavoriteProductsSerializer(serializers.Serializer):
+    product_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.FAVORITES_BULK_MAX_ITEMS,
+    )
+
+    @classmethod
+    def validate_product_ids(cls, value):
+        return list(dict.fromkeys(value))
@@ -11,7 +11,7 @@ class ProductFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = Product
 
-    id = factory.Faker("pyint", min_value=100000, max_value=999999)
+    id = factory.Sequence(lambda n: 100000 + n)
     title = factory.Faker("sentence", nb_words=3)
     image = factory.Faker("image_url")
     price = factory.Faker("pyfloat", left_digits=5, right_digits=2, positive=True)
@@ -0,0 +1,122 @@
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PRODUCT_PATH = re.compile(r"^/api/product/(?P<product_id>\d+)/$")
+PAGE_PATH = re.compile(r"^/api/product/\?page=(?P<page>\d+)$")
+
+
+class FakeCatalogServer:
+    def __init__(self, products: dict | None = None, delay: float = 0, page_size: int = 100):
+        self.products = products or {}
+        self.delay = delay
+        self.page_size = page_size
+        self.hits = Counter()
+        self.page_hits = Counter()
+        # Products and pages that answer with a server error, to exercise retries and resuming.
+        self.failing_products = set()
+        self.failing_pages = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/product/"
+
+    def add_product(self, product_id: int, **fields):
+        self.products[product_id] = {
+            "id": product_id,
+            "title": f"Product {product_id}",
+            "image": f"http://example.com/{product_id}.jpg",
+            "price": 10.0,
+            "brand": "fake",
+            **fields,
+        }
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _record(self, product_id: int):
+        with self._lock:
+            self.hits[product_id] += 1
+
+    def _record_page(self, page: int):
+        with self._lock:
+            self.page_hits[page] += 1
+
+    def page(self, page: int) -> list[dict]:
+        product_ids = sorted(self.products)[(page - 1) * self.page_size : page * self.page_size]
+        return [self.products[product_id] for product_id in product_ids]
+
+    def _handler_class(self):
+        catalog = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                page_match = PAGE_PATH.match(self.path)
+                if page_match:
+                    self._send_page(int(page_match["page"]))
+                    return
+                match = PRODUCT_PATH.match(self.path)
+                if not match:
+                    self._send(HTTPStatus.NOT_FOUND, {})
+                    return
+                product_id = int(match["product_id"])
+                catalog._record(product_id)
+                if catalog.delay:
+                    time.sleep(catalog.delay)
+                if product_id in catalog.failing_products:
+                    self._send(HTTPStatus.SERVICE_UNAVAILABLE, {})
+                    return
+                product = catalog.products.get(product_id)
+                if product is None:
+                    self._send(HTTPStatus.NOT_FOUND, {"error_message": "Product not found", "code": "not_found"})
+                    return
+                self._send(HTTPStatus.OK, product)
+
+            def _send_page(self, page):
+                catalog._record_page(page)
+                if catalog.delay:
+                    time.sleep(catalog.delay)
+                if page in catalog.failing_pages:
+                    self._send(HTTPStatus.SERVICE_UNAVAILABLE, {})
+                    return
+                products = catalog.page(page) if page > 0 else []
+                if not products:
+                    self._send(HTTPStatus.NOT_FOUND, {"error_message": "Page not found", "code": "not_found"})
+                    return
+                self._send(
+                    HTTPStatus.OK,
+                    {"meta": {"page_number": page, "page_size": catalog.page_size}, "products": products},
+                )
+
+            def _send(self, status_code, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from v1.customers.tests.factories import CustomerWithProductsFactory
+from v1.favorites import products
+from v1.favorites.caches import get_cached_product
+from v1.favorites.catalog import CatalogUnavailable, get_async_catalog_client
+from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.products import afetch_product
+from v1.favorites.tests.factories import ProductFactory
+
+
+@pytest.mark.django_db
+def test_async_add_product_from_catalog(api_user_authenticated, customer, fake_catalog):
+    fake_catalog.add_product(2, title="New Product", price=150.0, review_score=4)
+
+    url = reverse("async_add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.post(url, {"product_id": 2})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    product = Product.objects.get(id=2)
+    assert product.title == "New Product"
+    assert get_cached_product(2).data["title"] == "New Product"
+    assert FavoriteProduct.objects.filter(favorite=customer.favorite, product=product).exists()
+
+
+@pytest.mark.django_db
+def test_async_add_product_from_database(api_user_authenticated, customer, product, fake_catalog):
+    url = reverse("async_add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.post(url, {"product_id": product.id})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert FavoriteProduct.objects.filter(favorite=customer.favorite, product=product).exists()
+    assert fake_catalog.hits[product.id] == 0
+
+
+@pytest.mark.django_db
+def test_async_add_duplicate_product(api_user_authenticated, customer, product):
+    FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+
+    url = reverse("async_add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.post(url, {"product_id": product.id})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get("error") == "Product is already in favorites."
+
+
+@pytest.mark.django_db
+def test_async_add_product_not_found(api_user_authenticated, customer, fake_catalog):
+    url = reverse("async_add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.post(url, {"product_id": 999})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json().get("error") == "Product not found."
+
+
+@pytest.mark.django_db
+def test_async_add_product_without_product_id(api_user_authenticated, customer):
+    url = reverse("async_add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.post(url, {})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get("error") == "product_id is required."
+
+
+@pytest.mark.django_db
+def test_async_add_product_with_nonexistent_customer(api_user_authenticated, product):
+    url = reverse("async_add_favorite_product", args=[9999])
+    response = api_user_authenticated.post(url, {"product_id": product.id})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json().get("error") == "Customer not found."
+
+
+@pytest.mark.django_db
+def test_async_add_product_non_authenticated(customer, product):
+    url = reverse("async_add_favorite_product", args=[customer.id])
+    response = APIClient().post(url, {"product_id": product.id})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_async_get_favorite_products(api_user_authenticated):
+    customer = CustomerWithProductsFactory()
+
+    url = reverse("async_add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    number_of_products = 5
+    assert len(response.json()) == number_of_products
+
+
+@pytest.mark.django_db
+def test_async_delete_favorite_product(api_user_authenticated):
+    customer = CustomerWithProductsFactory()
+    product = customer.favorite.products.first()
+
+    url = reverse("async_delete_favorite_product", args=[customer.id, product.id])
+    response = api_user_authenticated.delete(url)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not FavoriteProduct.objects.filter(favorite=customer.favorite, product=product).exists()
+
+
+@pytest.mark.django_db
+def test_async_delete_product_not_in_favorites(api_user_authenticated, customer):
+    product = ProductFactory()
+
+    url = reverse("async_delete_favorite_product", args=[customer.id, product.id])
+    response = api_user_authenticated.delete(url)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json().get("detail") == "Product is not in favorites."
+
+
+@pytest.mark.django_db
+def test_afetch_product_shares_in_flight_fetch(fake_catalog):
+    fake_catalog.delay = 0.2
+    fake_catalog.add_product(1)
+
+    async def fetch_concurrently():
+        return await asyncio.gather(*(afetch_product(1) for _ in range(10)))
+
+    products = async_to_sync(fetch_concurrently)()
+
+    assert {product.id for product in products} == {1}
+    assert fake_catalog.hits[1] == 1
+
+
+@pytest.mark.django_db
+def test_afetch_product_waits_for_another_process_fetch(fake_catalog, settings):
+    settings.CATALOG_API = {**settings.CATALOG_API, "SINGLE_FLIGHT_WAIT_TIMEOUT": 0.2}
+    fake_catalog.add_product(1)
+    lock = products._single_flight_lock(1)
+    lock.acquire()
+
+    with pytest.raises(CatalogUnavailable):
+        async_to_sync(afetch_product)(1)
+    assert fake_catalog.hits[1] == 0
+
+    lock.release()
+    assert async_to_sync(afetch_product)(1).id == 1
+
+
+def test_async_catalog_client_is_closed_with_its_loop():
+    async def get_clients():
+        return get_async_catalog_client(), get_async_catalog_client()
+
+    client, same_client = async_to_sync(get_clients)()
+
+    assert client is same_client
+    assert client.session.is_closed
@@ -0,0 +1,262 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework import status
+
+from v1.common.local_cache import InvalidationListener, LRUCache
+from v1.customers.tests.factories import CustomerWithProductsFactory
+from v1.favorites.caches import (
+    CachedProduct,
+    get_cached_favorites,
+    get_cached_product,
+    invalidate_cached_favorites,
+    invalidate_cached_products,
+    set_cached_favorites,
+    set_cached_product,
+    set_cached_products,
+)
+from v1.favorites.models import FavoriteProduct
+from v1.favorites.products import get_product, product_cache_data
+from v1.favorites.tests.factories import ProductFactory
+
+
+def _favorites_url(customer):
+    return reverse("add_favorite_product", args=[customer.id])
+
+
+def test_cached_favorites_are_versioned():
+    assert get_cached_favorites(1) == (None, 0)
+
+    set_cached_favorites(1, 0, [{"title": "TV"}])
+    assert get_cached_favorites(1) == ([{"title": "TV"}], 0)
+
+    invalidate_cached_favorites(1)
+    assert get_cached_favorites(1) == (None, 1)
+
+    set_cached_favorites(1, 0, [{"title": "Stale"}])
+    assert get_cached_favorites(1) == (None, 1)
+
+    invalidate_cached_favorites(1, 2)
+    assert get_cached_favorites(1) == (None, 2)
+    assert get_cached_favorites(2) == (None, 1)
+
+
+@pytest.mark.django_db
+def test_repeated_favorites_read_hits_only_the_cache(api_user_authenticated, django_assert_num_queries):
+    customer = CustomerWithProductsFactory()
+    first_response = api_user_authenticated.get(_favorites_url(customer))
+
+    with django_assert_num_queries(0):
+        response = api_user_authenticated.get(_favorites_url(customer))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == first_response.json()
+
+
+@pytest.mark.django_db
+def test_adding_favorite_invalidates_cache(api_user_authenticated, customer, product):
+    assert api_user_authenticated.get(_favorites_url(customer)).json() == []
+
+    api_user_authenticated.post(_favorites_url(customer), {"product_id": product.id})
+
+    assert [product_data["title"] for product_data in api_user_authenticated.get(_favorites_url(customer)).json()] == [
+        product.title
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_adding_favorites_invalidates_cache(api_user_authenticated, customer, product):
+    api_user_authenticated.get(_favorites_url(customer))
+
+    url = reverse("bulk_add_favorite_products", args=[customer.id])
+    api_user_authenticated.post(url, {"product_ids": [product.id]}, format="json")
+
+    assert len(api_user_authenticated.get(_favorites_url(customer)).json()) == 1
+
+
+@pytest.mark.django_db
+def test_removing_favorite_invalidates_cache(api_user_authenticated):
+    customer = CustomerWithProductsFactory()
+    product = customer.favorite.products.first()
+    api_user_authenticated.get(_favorites_url(customer))
+
+    api_user_authenticated.delete(reverse("delete_favorite_product", args=[customer.id, product.id]))
+
+    titles = [product_data["title"] for product_data in api_user_authenticated.get(_favorites_url(customer)).json()]
+    assert product.title not in titles
+
+
+@pytest.mark.django_db
+def test_updating_product_invalidates_cache(api_user_authenticated, customer):
+    product = ProductFactory(price="10.00")
+    FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+    api_user_authenticated.get(_favorites_url(customer))
+
+    product.price = "12.50"
+    product.save()
+
+    assert api_user_authenticated.get(_favorites_url(customer)).json()[0]["price"] == "12.50"
+
+
+@pytest.mark.django_db
+def test_deleting_customer_invalidates_cache(api_user_authenticated, customer):
+    url = _favorites_url(customer)
+    api_user_authenticated.get(url)
+
+    customer.delete()
+
+    assert api_user_authenticated.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_products_are_cached_under_a_namespaced_key_with_ttl(settings, product):
+    set_cached_product(product.id, product_cache_data(product))
+
+    assert cache.get(product.id) is None
+    assert (
+        cache.ttl(f"product:{product.id}")
+        == settings.PRODUCT_CACHE["TIMEOUT"] + settings.PRODUCT_CACHE["STALE_TIMEOUT"]
+    )
+    assert get_cached_product(product.id) == CachedProduct(product_cache_data(product), stale=False)
+
+
+def test_missing_products_are_cached_briefly(settings):
+    set_cached_product(1, None)
+
+    assert cache.ttl("product:1") == settings.PRODUCT_CACHE["NOT_FOUND_TIMEOUT"]
+    assert get_cached_product(1) == CachedProduct(None, stale=False)
+
+
+@pytest.mark.django_db
+def test_get_product_serves_missing_product_from_cache(fake_catalog, django_assert_num_queries):
+    assert get_product(1) is None
+
+    with django_assert_num_queries(0):
+        assert get_product(1) is None
+    assert fake_catalog.hits[1] == 1
+
+
+@pytest.mark.django_db
+def test_stale_product_is_revalidated_by_one_caller(settings, product, django_assert_num_queries):
+    settings.PRODUCT_CACHE = {**settings.PRODUCT_CACHE, "TIMEOUT": 0}
+    set_cached_product(product.id, {**product_cache_data(product), "title": "Old"})
+
+    with django_assert_num_queries(1):
+        assert get_product(product.id).title == product.title
+
+    set_cached_product(product.id, {**product_cache_data(product), "title": "Old"})
+    with django_assert_num_queries(0):
+        assert get_product(product.id).title == "Old"
+
+
+@pytest.mark.django_db
+def test_updating_product_invalidates_product_cache(product):
+    set_cached_product(product.id, product_cache_data(product))
+
+    product.title = "New title"
+    product.save()
+
+    assert get_cached_product(product.id) is None
+
+
+@pytest.fixture
+def local_product_cache(settings):
+    settings.PRODUCT_LOCAL_CACHE = {**settings.PRODUCT_LOCAL_CACHE, "ENABLED": True}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("local_product_cache")
+def test_local_product_cache_skips_redis(product):
+    set_cached_product(product.id, product_cache_data(product))
+    cache.delete(f"product:{product.id}")
+
+    assert get_cached_product(product.id).data == product_cache_data(product)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("local_product_cache")
+def test_product_changes_are_broadcast_to_other_workers(settings, product):
+    other_worker_cache = LRUCache(max_size=10, timeout=60)
+    other_worker_cache.set(f"product:{product.id}", b"cached")
+    listener = InvalidationListener(
+        settings.PRODUCT_LOCAL_CACHE["INVALIDATION_CHANNEL"], other_worker_cache, poll_timeout=0.1
+    )
+    listener.start()
+    try:
+        product.price = "1.00"
+        product.save()
+
+        deadline = time.monotonic() + 2
+        while other_worker_cache.get(f"product:{product.id}") is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert other_worker_cache.get(f"product:{product.id}") is None
+    finally:
+        listener.stop()
+        listener.join()
+
+
+def _published_invalidations(pubsub):
+    messages = []
+    deadline = time.monotonic() + 0.5
+    while time.monotonic() < deadline:
+        message = pubsub.get_message(timeout=0.1)
+        if message is not None:
+            messages.append(message["data"].decode().split("\n")[1:])
+    return messages
+
+
+@pytest.fixture
+def invalidation_subscriber(settings):
+    pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(settings.PRODUCT_LOCAL_CACHE["INVALIDATION_CHANNEL"])
+    yield pubsub
+    pubsub.close()
+
+
+@pytest.mark.django_db
+def test_product_cache_writes_and_deletes_publish_nothing_without_a_local_tier(settings, invalidation_subscriber):
+    settings.PRODUCT_LOCAL_CACHE = {**settings.PRODUCT_LOCAL_CACHE, "ENABLED": False}
+
+    set_cached_products({1: None, 2: None})
+    invalidate_cached_products(1, 2)
+
+    assert _published_invalidations(invalidation_subscriber) == []
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("local_product_cache")
+def test_product_cache_writes_and_deletes_publish_one_batch(invalidation_subscriber):
+    set_cached_products({1: None, 2: None})
+    invalidate_cached_products(1, 2)
+
+    assert _published_invalidations(invalidation_subscriber) == [
+        ["product:1", "product:2"],
+        ["product:1", "product:2"],
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("local_product_cache")
+def test_product_cache_writes_refresh_other_workers_but_not_the_writer(settings, product):
+    other_worker_cache = LRUCache(max_size=10, timeout=60)
+    other_worker_cache.set(f"product:{product.id}", b"stale")
+    listener = InvalidationListener(
+        settings.PRODUCT_LOCAL_CACHE["INVALIDATION_CHANNEL"], other_worker_cache, poll_timeout=0.1
+    )
+    listener.start()
+    try:
+        set_cached_product(product.id, product_cache_data(product))
+
+        deadline = time.monotonic() + 2
+        while other_worker_cache.get(f"product:{product.id}") is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert other_worker_cache.get(f"product:{product.id}") is None
+        time.sleep(0.3)
+        cache.delete(f"product:{product.id}")
+        assert get_cached_product(product.id).data == product_cache_data(product)
+    finally:
+        listener.stop()
+        listener.join()
@@ -0,0 +1,124 @@
+import pytest
+import requests
+import responses
+from django.urls import reverse
+from rest_framework import status
+
+from v1.favorites.catalog import CatalogUnavailable, CircuitBreaker, get_catalog_client
+
+PRODUCT_URL = "http://challenge-api.luizalabs.com/api/product/1/"
+
+
+@pytest.fixture(autouse=True)
+def catalog_settings(settings):
+    settings.CATALOG_API = {
+        **settings.CATALOG_API,
+        "MAX_RETRIES": 2,
+        "BACKOFF_FACTOR": 0,
+        "CIRCUIT_BREAKER_FAILURE_THRESHOLD": 2,
+        "CIRCUIT_BREAKER_RESET_TIMEOUT": 60,
+    }
+
+
+def test_catalog_client_is_shared():
+    assert get_catalog_client() is get_catalog_client()
+
+
+def test_catalog_client_applies_timeouts(settings):
+    client = get_catalog_client()
+    assert client.timeout == (settings.CATALOG_API["CONNECT_TIMEOUT"], settings.CATALOG_API["READ_TIMEOUT"])
+
+
+@responses.activate
+def test_get_product():
+    responses.add(responses.GET, PRODUCT_URL, json={"id": 1, "title": "TV"}, status=200)
+
+    assert get_catalog_client().get_product(1) == {"id": 1, "title": "TV"}
+
+
+@responses.activate
+def test_get_product_not_found():
+    responses.add(responses.GET, PRODUCT_URL, status=404)
+
+    assert get_catalog_client().get_product(1) is None
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_get_page():
+    responses.add(
+        responses.GET,
+        "http://challenge-api.luizalabs.com/api/product/?page=2",
+        json={"meta": {"page_number": 2, "page_size": 100}, "products": [{"id": 1}]},
+        status=200,
+    )
+    responses.add(responses.GET, "http://challenge-api.luizalabs.com/api/product/?page=3", status=404)
+
+    assert get_catalog_client().get_page(2) == [{"id": 1}]
+    assert get_catalog_client().get_page(3) == []
+
+
+@responses.activate
+def test_get_product_retries_server_errors():
+    responses.add(responses.GET, PRODUCT_URL, status=503)
+    responses.add(responses.GET, PRODUCT_URL, body=requests.ConnectTimeout())
+    responses.add(responses.GET, PRODUCT_URL, json={"id": 1}, status=200)
+
+    assert get_catalog_client().get_product(1) == {"id": 1}
+    number_of_calls = 3
+    assert len(responses.calls) == number_of_calls
+
+
+@responses.activate
+def test_get_product_gives_up_after_max_retries():
+    responses.add(responses.GET, PRODUCT_URL, body=requests.ReadTimeout())
+
+    with pytest.raises(CatalogUnavailable):
+        get_catalog_client().get_product(1)
+    number_of_calls = 3
+    assert len(responses.calls) == number_of_calls
+
+
+@responses.activate
+def test_circuit_breaker_opens_after_consecutive_failures():
+    responses.add(responses.GET, PRODUCT_URL, status=500)
+    client = get_catalog_client()
+
+    for _ in range(2):
+        with pytest.raises(CatalogUnavailable):
+            client.get_product(1)
+    calls_before_open = len(responses.calls)
+
+    with pytest.raises(CatalogUnavailable, match="circuit breaker is open"):
+        client.get_product(1)
+    assert client.breaker.is_open
+    assert len(responses.calls) == calls_before_open
+
+
+def test_circuit_breaker_half_open_probe(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("v1.favorites.catalog.time.monotonic", lambda: now)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    now += 10
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow_request()
+
+
+@pytest.mark.django_db
+@responses.activate
+def test_add_product_when_catalog_is_unavailable(api_user_authenticated, customer):
+    responses.add(responses.GET, PRODUCT_URL, status=502)
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.post(url, {"product_id": 1})
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json().get("error") == "Product catalog unavailable."
@@ -1,5 +1,5 @@
 import pytest
-from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 
 from v1.customers.tests.factories import CustomerFactory, CustomerWithProductsFactory
 from v1.favorites.models import FavoriteProduct
@@ -70,7 +70,7 @@ def test_favorite_two_products_favorite_lists_raise_error(customer):
 
     FavoriteProduct.objects.create(favorite=favorite, product=product)
 
-    with pytest.raises(ValidationError, match=f"The product {product.id} is already in the favorites."):
+    with pytest.raises(IntegrityError):
         FavoriteProduct.objects.create(favorite=favorite, product=product)
 
 
@@ -78,3 +78,23 @@ def test_favorite_two_products_favorite_lists_raise_error(customer):
 def test_product_link_generation():
     product = ProductFactory(link="")
     assert product.link == f"http://challenge-api.luizalabs.com/api/product/{product.id}/"
+
+
+@pytest.mark.django_db
+def test_deleting_product_removes_it_from_favorites():
+    customer = CustomerWithProductsFactory()
+    product = customer.favorite.products.first()
+
+    product.delete()
+
+    assert not FavoriteProduct.objects.filter(product_id=product.id).exists()
+
+
+@pytest.mark.django_db
+def test_deleting_customer_removes_its_favorite_products():
+    customer = CustomerWithProductsFactory()
+    favorite_id = customer.favorite.pk
+
+    customer.delete()
+
+    assert not FavoriteProduct.objects.filter(favorite_id=favorite_id).exists()
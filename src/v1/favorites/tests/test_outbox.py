@@ -0,0 +1,158 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from v1.favorites import products
+from v1.favorites.caches import get_cached_product
+from v1.favorites.models import FavoriteProduct, Product, ProductOutbox
+from v1.favorites.products import get_or_enqueue_product, get_product, process_product_outbox
+
+
+@pytest.fixture
+def async_resolution(settings, fake_catalog):
+    settings.FAVORITES_ASYNC_CATALOG_RESOLUTION = True
+    settings.CATALOG_API = {**settings.CATALOG_API, "MAX_RETRIES": 0}
+    return fake_catalog
+
+
+def _favorites_url(customer):
+    return reverse("add_favorite_product", kwargs={"customer_id": customer.id})
+
+
+@pytest.mark.django_db
+def test_add_unknown_product_is_recorded_without_calling_the_catalog(
+    api_user_authenticated, customer, async_resolution
+):
+    response = api_user_authenticated.post(_favorites_url(customer), {"product_id": 7})
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert async_resolution.hits[7] == 0
+    assert Product.objects.get(id=7).status == Product.Status.PENDING
+    assert ProductOutbox.objects.filter(product_id=7).exists()
+    assert FavoriteProduct.objects.filter(favorite_id=customer.id, product_id=7).exists()
+    # Pending placeholders are hidden from listings until resolved.
+    assert api_user_authenticated.get(_favorites_url(customer)).json() == []
+
+
+@pytest.mark.django_db
+def test_add_known_product_is_unchanged(api_user_authenticated, customer, product, async_resolution):
+    response = api_user_authenticated.post(_favorites_url(customer), {"product_id": product.id})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert not ProductOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+def test_async_view_enqueues_too(api_user_authenticated, customer, async_resolution):
+    url = reverse("async_add_favorite_product", kwargs={"customer_id": customer.id})
+
+    response = api_user_authenticated.post(url, {"product_id": 7})
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert ProductOutbox.objects.filter(product_id=7).exists()
+
+
+@pytest.mark.django_db
+def test_pending_product_is_enqueued_once(async_resolution):
+    first = get_or_enqueue_product(7)
+    second = get_or_enqueue_product(7)
+
+    assert first.id == second.id
+    assert ProductOutbox.objects.count() == 1
+    assert get_cached_product(7) is None
+
+
+@pytest.mark.django_db
+def test_outbox_resolves_products(api_user_authenticated, customer, async_resolution):
+    async_resolution.add_product(7, title="TV", price=99.9, review_score=4)
+    api_user_authenticated.post(_favorites_url(customer), {"product_id": 7})
+
+    report = process_product_outbox(batch_size=10, concurrency=2)
+
+    assert report == {"resolved": 1, "unresolvable": 0, "retried": 0}
+    product = Product.objects.get(id=7)
+    assert (product.status, product.title, str(product.price)) == (Product.Status.RESOLVED, "TV", "99.90")
+    assert not ProductOutbox.objects.exists()
+    assert [item["title"] for item in api_user_authenticated.get(_favorites_url(customer)).json()] == ["TV"]
+
+
+@pytest.mark.django_db
+def test_outbox_marks_unknown_products_unresolvable(api_user_authenticated, customer, async_resolution):
+    api_user_authenticated.post(_favorites_url(customer), {"product_id": 7})
+
+    report = process_product_outbox(batch_size=10, concurrency=2)
+
+    assert report == {"resolved": 0, "unresolvable": 1, "retried": 0}
+    assert Product.objects.get(id=7).status == Product.Status.UNRESOLVABLE
+    assert not FavoriteProduct.objects.filter(product_id=7).exists()
+    assert get_product(7) is None
+    response = api_user_authenticated.post(_favorites_url(customer), {"product_id": 7})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_outbox_retries_when_catalog_is_unavailable(async_resolution):
+    async_resolution.failing_products = {7}
+    get_or_enqueue_product(7)
+
+    report = process_product_outbox(batch_size=10, concurrency=2)
+
+    assert report == {"resolved": 0, "unresolvable": 0, "retried": 1}
+    entry = ProductOutbox.objects.get(product_id=7)
+    assert entry.attempts == 1
+    assert entry.available_at > timezone.now()
+    # Not due yet, so the next pass leaves it alone.
+    assert process_product_outbox(batch_size=10, concurrency=2) == {"resolved": 0, "unresolvable": 0, "retried": 0}
+
+    ProductOutbox.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+    async_resolution.failing_products = set()
+    async_resolution.add_product(7)
+    assert process_product_outbox(batch_size=10, concurrency=2)["resolved"] == 1
+
+
+@pytest.mark.django_db
+def test_claimed_outbox_entries_are_leased(async_resolution):
+    get_or_enqueue_product(7)
+
+    entries, leased_until = products._claim_outbox_entries(batch_size=10)
+
+    assert [entry.product_id for entry in entries] == [7]
+    assert ProductOutbox.objects.get(product_id=7).available_at == leased_until
+    assert leased_until > timezone.now()
+    # Another worker finds nothing due while the lease lasts.
+    assert products._claim_outbox_entries(batch_size=10)[0] == []
+
+
+@pytest.mark.django_db
+def test_outbox_leaves_entries_whose_lease_was_taken_over(async_resolution, monkeypatch):
+    async_resolution.add_product(7)
+    get_or_enqueue_product(7)
+    claim = products._claim_outbox_entries
+
+    def claim_and_lose_lease(batch_size):
+        entries, leased_until = claim(batch_size)
+        # The lease ran out during the fetch and another worker claimed the entry.
+        ProductOutbox.objects.update(available_at=leased_until + timedelta(seconds=1))
+        return entries, leased_until
+
+    monkeypatch.setattr(products, "_claim_outbox_entries", claim_and_lose_lease)
+
+    assert process_product_outbox(batch_size=10, concurrency=2) == {"resolved": 0, "unresolvable": 0, "retried": 0}
+    assert Product.objects.get(id=7).status == Product.Status.PENDING
+    assert ProductOutbox.objects.filter(product_id=7).exists()
+
+
+@pytest.mark.django_db
+def test_process_product_outbox_command(async_resolution):
+    async_resolution.add_product(7)
+    async_resolution.add_product(8)
+    get_or_enqueue_product(7)
+    get_or_enqueue_product(8)
+
+    call_command("process_product_outbox", "--batch-size", "1")
+
+    assert set(Product.objects.values_list("status", flat=True)) == {Product.Status.RESOLVED}
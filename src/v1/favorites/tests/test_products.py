@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from v1.customers.tests.factories import CustomerFactory
+from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.products import fetch_product
+
+NUMBER_OF_CLIENTS = 10
+
+
+def _add_favorite_concurrently(user, customers, product_id):
+    def add_favorite(customer):
+        try:
+            api_client = APIClient()
+            api_client.force_authenticate(user=user)
+            url = reverse("add_favorite_product", args=[customer.id])
+            return api_client.post(url, {"product_id": product_id}).status_code
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=len(customers)) as executor:
+        return list(executor.map(add_favorite, customers))
+
+
+@pytest.mark.django_db
+def test_fetch_product_from_catalog(fake_catalog):
+    fake_catalog.add_product(1, title="TV", review_score=4)
+
+    product = fetch_product(1)
+
+    assert product.title == "TV"
+    assert Product.objects.filter(id=1, review_score=4).exists()
+
+
+@pytest.mark.django_db
+def test_fetch_product_not_found_is_remembered_while_in_flight(fake_catalog):
+    assert fetch_product(1) is None
+    assert fetch_product(1) is None
+    assert fake_catalog.hits[1] == 1
+
+
+@pytest.mark.django_db
+def test_fetch_product_already_in_database(fake_catalog, product):
+    assert fetch_product(product.id) == product
+    assert fake_catalog.hits[product.id] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_adds_fetch_product_once(fake_catalog, normal_user):
+    fake_catalog.delay = 0.2
+    fake_catalog.add_product(1)
+    customers = CustomerFactory.create_batch(NUMBER_OF_CLIENTS)
+
+    status_codes = _add_favorite_concurrently(normal_user, customers, 1)
+
+    assert status_codes == [status.HTTP_201_CREATED] * NUMBER_OF_CLIENTS
+    assert fake_catalog.hits[1] == 1
+    assert Product.objects.filter(id=1).count() == 1
+    assert FavoriteProduct.objects.filter(product_id=1).count() == NUMBER_OF_CLIENTS
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_adds_of_unknown_product_fetch_once(fake_catalog, normal_user):
+    fake_catalog.delay = 0.2
+    customers = CustomerFactory.create_batch(NUMBER_OF_CLIENTS)
+
+    status_codes = _add_favorite_concurrently(normal_user, customers, 1)
+
+    assert status_codes == [status.HTTP_404_NOT_FOUND] * NUMBER_OF_CLIENTS
+    assert fake_catalog.hits[1] == 1
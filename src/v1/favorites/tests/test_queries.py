@@ -0,0 +1,57 @@
+import re
+
+import pytest
+from django.db import connection
+
+from v1.customers.tests.factories import CustomerWithProductsFactory
+from v1.favorites.models import FavoriteProduct
+from v1.favorites.tests.factories import ProductFactory
+
+
+@pytest.fixture
+def without_seqscan():
+    # Test tables are tiny, so the planner would happily scan them sequentially or through a bitmap and sort.
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+
+
+def _explain(queryset) -> str:
+    # Statistics left behind by earlier tests describe other data; refresh them for the rows this test created.
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE favorites_favoriteproduct")
+        cursor.execute("ANALYZE favorites_product")
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("without_seqscan")
+def test_favorites_listing_uses_covering_index():
+    # Other customers' favorites make the product table larger than one listing, as it is outside tests.
+    customer, *_ = CustomerWithProductsFactory.create_batch(20)
+
+    # Only the favoriteproduct side of the listing: the join to product is the planner's call, and product's columns
+    # are never in this index.
+    listing = (
+        FavoriteProduct.objects.filter(favorite_id=customer.id)
+        .order_by("created_at", "id")
+        .values_list("id", "created_at", "product_id")
+    )
+    plan = _explain(listing)
+
+    assert re.search(r"Index (Only )?Scan using favoriteproduct_listing_idx", plan)
+    assert "Sort" not in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("without_seqscan")
+def test_favorite_product_lookup_uses_an_index():
+    # A popular product: many customers hold it, so product_id alone is not selective.
+    product = ProductFactory()
+    customer, *_ = CustomerWithProductsFactory.create_batch(20, favorite=[product])
+
+    plan = _explain(FavoriteProduct.objects.filter(favorite=customer.favorite, product=product))
+
+    # Both the unique constraint and the listing index lead with favorite_id; either one will do.
+    assert re.search(r"Index Cond: \(+favorite_id = ", plan)
+    assert "Seq Scan" not in plan
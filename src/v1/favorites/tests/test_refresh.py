@@ -0,0 +1,110 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from v1.customers.tests.factories import CustomerFactory
+from v1.favorites.caches import get_cached_favorites, get_cached_product, invalidate_cached_favorites
+from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.products import get_product, refresh_stale_products
+from v1.favorites.tests.factories import ProductFactory
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def catalog(fake_catalog, settings):
+    settings.CATALOG_API = {**settings.CATALOG_API, "MAX_RETRIES": 0}
+    return fake_catalog
+
+
+def _stale_product(**fields):
+    product = ProductFactory(**fields)
+    Product.objects.filter(id=product.id).update(refreshed_at=timezone.now() - timedelta(days=2))
+    return product
+
+
+@pytest.mark.django_db
+def test_refresh_updates_changed_products(catalog):
+    product = _stale_product(title="TV", price="10.00", review_score=3)
+    catalog.add_product(product.id, title="TV", image=product.image, price=12.5, review_score=4)
+    get_product(product.id)
+
+    report = refresh_stale_products(max_age=DAY, batch_size=10, concurrency=2)
+
+    assert report == {"checked": 1, "changed": 1, "missing": 0, "unavailable": 0}
+    assert get_cached_product(product.id) is None
+    product.refresh_from_db()
+    assert (product.price, product.review_score) == (Decimal("12.50"), 4)
+    assert product.refreshed_at > timezone.now() - timedelta(minutes=1)
+
+
+@pytest.mark.django_db
+def test_refresh_keeps_cache_of_unchanged_products(catalog):
+    product = _stale_product(price="10.00")
+    catalog.add_product(
+        product.id, title=product.title, image=product.image, price=10, review_score=product.review_score
+    )
+    get_product(product.id)
+
+    report = refresh_stale_products(max_age=DAY, batch_size=10, concurrency=2)
+
+    assert report["changed"] == 0
+    assert get_cached_product(product.id) is not None
+    product.refresh_from_db()
+    assert product.refreshed_at > timezone.now() - timedelta(minutes=1)
+
+
+@pytest.mark.django_db
+def test_refresh_invalidates_favorites_with_changed_products(catalog):
+    customer = CustomerFactory()
+    product = _stale_product()
+    FavoriteProduct.objects.add_product(customer.id, product.id)
+    invalidate_cached_favorites(customer.id)
+    _, version = get_cached_favorites(customer.id)
+    catalog.add_product(product.id, title="Renamed")
+
+    refresh_stale_products(max_age=DAY, batch_size=10, concurrency=2)
+
+    assert get_cached_favorites(customer.id)[1] > version
+
+
+@pytest.mark.django_db
+def test_refresh_skips_fresh_products_and_batches_the_rest(catalog, django_assert_max_num_queries):
+    fresh = ProductFactory()
+    stale = [_stale_product() for _ in range(5)]
+    for product in stale:
+        catalog.add_product(product.id, title="Renamed")
+
+    # Per batch of two: the select, the bulk update, the refreshed_at bump and the favorites lookup.
+    with django_assert_max_num_queries(3 * 4 + 1):
+        report = refresh_stale_products(max_age=DAY, batch_size=2, concurrency=2)
+
+    assert report["changed"] == len(stale)
+    assert catalog.hits[fresh.id] == 0
+    assert set(Product.objects.filter(title="Renamed").values_list("id", flat=True)) == {p.id for p in stale}
+
+
+@pytest.mark.django_db
+def test_refresh_leaves_unreachable_and_missing_products(catalog):
+    missing = _stale_product()
+    unavailable = _stale_product()
+    catalog.failing_products = {unavailable.id}
+
+    report = refresh_stale_products(max_age=DAY, batch_size=10, concurrency=2)
+
+    assert report == {"checked": 1, "changed": 0, "missing": 1, "unavailable": 1}
+    assert Product.objects.filter(id=missing.id, refreshed_at__gt=timezone.now() - timedelta(minutes=1)).exists()
+    assert Product.objects.filter(id=unavailable.id, refreshed_at__lt=timezone.now() - timedelta(days=1)).exists()
+
+
+@pytest.mark.django_db
+def test_refresh_products_command(catalog):
+    product = _stale_product()
+    catalog.add_product(product.id, title="Renamed")
+
+    call_command("refresh_products", "--limit", "1")
+
+    assert Product.objects.get(id=product.id).title == "Renamed"
@@ -1,7 +1,15 @@
 import pytest
+from rest_framework.renderers import JSONRenderer
 
+from v1.common.renderers import ORJSONRenderer
 from v1.favorites.models import FavoriteProduct, Product
-from v1.favorites.serializers import FavoriteProductSerializer, FavoriteSerializer, ProductSerializer
+from v1.favorites.serializers import (
+    PRODUCT_REPRESENTATION_FIELDS,
+    FavoriteProductSerializer,
+    FavoriteSerializer,
+    ProductSerializer,
+    product_row_representation,
+)
 from v1.favorites.tests.factories import FavoriteProductFactory, ProductFactory
 
 
@@ -52,3 +60,25 @@ def test_product_serializer_with_no_review_score(api_user_authenticated, custome
     assert "image" in serializer.data
     assert "price" in serializer.data
     assert "link" in serializer.data
+
+
+def _assert_rendered_identically(expected, actual):
+    assert JSONRenderer().render(actual) == JSONRenderer().render(expected)
+    assert ORJSONRenderer.render(actual) == ORJSONRenderer.render(expected)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("price", ["0.00", "0.10", "9.99", "10.00", "1999.90", "99999.99"])
+@pytest.mark.parametrize("review_score", [None, 0, 5])
+def test_product_row_representation_matches_serializer(price, review_score):
+    product = Product.objects.create(
+        id=1,
+        title="Cafeteira Elétrica “Expresso” – 110V",
+        image="http://example.com/image1.jpg",
+        price=price,
+        review_score=review_score,
+    )
+    product.refresh_from_db()
+    row = Product.objects.values_list(*PRODUCT_REPRESENTATION_FIELDS).get(pk=product.pk)
+
+    _assert_rendered_identically(ProductSerializer(product).data, product_row_representation(row))
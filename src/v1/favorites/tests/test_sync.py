@@ -0,0 +1,134 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from v1.customers.tests.factories import CustomerFactory
+from v1.favorites.caches import get_cached_favorites, get_cached_product, invalidate_cached_favorites
+from v1.favorites.catalog import CatalogUnavailable, RateLimiter
+from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.products import SYNC_CHECKPOINT_KEY, sync_products
+from v1.favorites.tests.factories import ProductFactory
+
+NUMBER_OF_PRODUCTS = 25
+
+
+@pytest.fixture
+def catalog(fake_catalog, settings):
+    settings.CATALOG_API = {**settings.CATALOG_API, "MAX_RETRIES": 0}
+    fake_catalog.page_size = 10
+    for product_id in range(1, NUMBER_OF_PRODUCTS + 1):
+        fake_catalog.add_product(product_id, price=19.9, review_score=3)
+    return fake_catalog
+
+
+@pytest.mark.django_db
+def test_sync_products_upserts_and_warms_cache(catalog):
+    ProductFactory(id=1, title="Old title")
+
+    report = sync_products(concurrency=2, rate_limit=0)
+
+    assert report == {"pages": 3, "products": NUMBER_OF_PRODUCTS, "next_page": None}
+    assert Product.objects.count() == NUMBER_OF_PRODUCTS
+    assert Product.objects.get(id=1).title == "Product 1"
+    assert get_cached_product(1).data == {
+        "id": 1,
+        "title": "Product 1",
+        "image": "http://example.com/1.jpg",
+        "price": "19.90",
+        "review_score": 3,
+        "link": "http://challenge-api.luizalabs.com/api/product/1/",
+    }
+    assert cache.get(SYNC_CHECKPOINT_KEY) is None
+
+
+@pytest.mark.django_db
+def test_sync_products_invalidates_favorites_holding_synced_products(catalog):
+    customer = CustomerFactory()
+    FavoriteProduct.objects.add_product(customer.id, ProductFactory(id=1).id)
+    invalidate_cached_favorites(customer.id)
+    _, version = get_cached_favorites(customer.id)
+
+    sync_products(concurrency=1, rate_limit=0, max_pages=1)
+
+    assert get_cached_favorites(customer.id)[1] > version
+
+
+@pytest.mark.django_db
+def test_sync_products_only_writes_changed_products(catalog):
+    sync_products(concurrency=1, rate_limit=0, max_pages=1)
+    customer = CustomerFactory()
+    FavoriteProduct.objects.add_product(customer.id, 1)
+    invalidate_cached_favorites(customer.id)
+    _, version = get_cached_favorites(customer.id)
+    refreshed_at = Product.objects.get(id=1).refreshed_at
+    catalog.products[2]["title"] = "New title"
+
+    sync_products(concurrency=1, rate_limit=0, start_page=1, max_pages=1)
+
+    assert get_cached_favorites(customer.id)[1] == version
+    assert Product.objects.get(id=1).refreshed_at > refreshed_at
+    assert Product.objects.get(id=2).title == "New title"
+    assert get_cached_product(2).data["title"] == "New title"
+
+
+@pytest.mark.django_db
+def test_sync_products_warms_a_cold_cache_from_an_unchanged_catalog(catalog):
+    sync_products(concurrency=1, rate_limit=0)
+    cache.clear()
+
+    sync_products(concurrency=1, rate_limit=0, start_page=1)
+
+    assert all(get_cached_product(product_id) for product_id in range(1, NUMBER_OF_PRODUCTS + 1))
+
+
+@pytest.mark.django_db
+def test_sync_products_resumes_from_checkpoint(catalog):
+    catalog.failing_pages = {2}
+
+    with pytest.raises(CatalogUnavailable):
+        sync_products(concurrency=3, rate_limit=0)
+
+    assert Product.objects.count() == catalog.page_size
+    assert cache.get(SYNC_CHECKPOINT_KEY) == 2  # noqa: PLR2004
+
+    catalog.failing_pages = set()
+    catalog.page_hits.clear()
+    report = sync_products(concurrency=3, rate_limit=0)
+
+    assert report["products"] == NUMBER_OF_PRODUCTS - catalog.page_size
+    assert Product.objects.count() == NUMBER_OF_PRODUCTS
+    assert catalog.page_hits[1] == 0
+
+
+@pytest.mark.django_db
+def test_sync_products_stops_after_max_pages(catalog):
+    report = sync_products(concurrency=4, rate_limit=0, max_pages=1)
+
+    assert report == {"pages": 1, "products": catalog.page_size, "next_page": 2}
+    assert sum(catalog.page_hits.values()) == 1
+
+
+def test_rate_limiter_spaces_calls():
+    rate_limiter = RateLimiter(rate=20)
+    started_at = time.monotonic()
+    for _ in range(3):
+        rate_limiter.wait()
+
+    assert time.monotonic() - started_at >= 2 / 20
+
+
+@pytest.mark.django_db
+def test_sync_products_command(catalog):
+    call_command("sync_products", "--concurrency", "2", "--rate-limit", "0")
+
+    assert Product.objects.count() == NUMBER_OF_PRODUCTS
+
+
+@pytest.mark.django_db
+def test_sync_products_command_reports_where_to_resume(catalog):
+    catalog.failing_pages = {1}
+
+    with pytest.raises(CommandError, match="resume from page 1"):
+        call_command("sync_products", "--rate-limit", "0")
@@ -1,27 +1,24 @@
+import base64
+import json
+from urllib.parse import urlencode
+
 import pytest
 import responses
-from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from v1.common.renderers import ORJSONRenderer
 from v1.customers.tests.factories import CustomerWithProductsFactory
+from v1.favorites.caches import CachedProduct, get_cached_product, set_cached_product
 from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.products import product_cache_data
 from v1.favorites.tests.factories import ProductFactory
 
 
 @pytest.mark.django_db
 def test_add_product_to_favorites_from_cache(api_user_authenticated, customer, product):
-    cache.set(
-        product.id,
-        {
-            "id": product.id,
-            "title": product.title,
-            "image": product.image,
-            "price": str(product.price),
-            "review_score": product.review_score,
-        },
-    )
+    set_cached_product(product.id, product_cache_data(product))
 
     url = reverse("add_favorite_product", args=[customer.id])
     response = api_user_authenticated.post(url, {"product_id": product.id})
@@ -30,6 +27,24 @@ def test_add_product_to_favorites_from_cache(api_user_authenticated, customer, p
     assert FavoriteProduct.objects.filter(favorite=customer.favorite, product=product).exists()
 
 
+@pytest.mark.django_db
+def test_add_cached_product_to_favorites_query_count(
+    api_user_authenticated, customer, product, django_assert_num_queries
+):
+    set_cached_product(product.id, product_cache_data(product))
+    url = reverse("add_favorite_product", args=[customer.id])
+
+    with django_assert_num_queries(2):
+        response = api_user_authenticated.post(url, {"product_id": product.id})
+
+    assert response.status_code == status.HTTP_201_CREATED
+    with django_assert_num_queries(2):
+        response = api_user_authenticated.post(url, {"product_id": product.id})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert FavoriteProduct.objects.filter(favorite=customer.favorite, product=product).count() == 1
+
+
 @pytest.mark.django_db
 def test_add_product_to_favorites_from_database(api_user_authenticated, customer, product):
     url = reverse("add_favorite_product", args=[customer.id])
@@ -111,8 +126,7 @@ def test_add_product_from_external_api(api_user_authenticated, customer):
     assert product.price == product_data["price"]
     assert product.review_score == product_data["review_score"]
 
-    cached_product = cache.get(product_id)
-    assert cached_product is not None
+    cached_product = get_cached_product(product_id).data
     assert cached_product["id"] == product_data["id"]
     assert cached_product["title"] == product_data["title"]
     assert cached_product["image"] == product_data["image"]
@@ -222,3 +236,253 @@ def test_get_favorite_products_without_review_score(api_user_authenticated, cust
     assert len(response_data) == number_of_products
     product_data = response_data[0]
     assert "review_score" not in product_data
+
+
+def _listed_product_data(product):
+    # The favorites list's own wire format: no id, and review_score after link only when there is one.
+    product_data = {"title": product.title, "image": product.image, "price": str(product.price), "link": product.link}
+    if product.review_score is not None:
+        product_data["review_score"] = product.review_score
+    return product_data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("price", ["0.10", "10.00", "99999.99"])
+@pytest.mark.parametrize("review_score", [None, 0, 5])
+def test_get_favorite_products_encodes_products_like_the_model(api_user_authenticated, customer, price, review_score):
+    product = ProductFactory(title="Cafeteira Elétrica “Expresso” – 110V", price=price, review_score=review_score)
+    FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+    product.refresh_from_db()
+    expected = ORJSONRenderer.render([_listed_product_data(product)])
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    # Built from the rows, then served from the cache, streamed and paginated.
+    assert api_user_authenticated.get(url).content == expected
+    assert api_user_authenticated.get(url).content == expected
+    assert b"".join(api_user_authenticated.get(url, {"stream": "true"}).streaming_content) == expected
+    assert api_user_authenticated.get(url, {"page_size": 10}).json()["results"] == json.loads(expected)
+
+
+@pytest.mark.django_db
+def test_bulk_add_products_to_favorites(api_user_authenticated, customer, fake_catalog):
+    cached_product, database_product, favorite_product = ProductFactory.create_batch(3)
+    set_cached_product(cached_product.id, product_cache_data(cached_product))
+    FavoriteProduct.objects.create(favorite=customer.favorite, product=favorite_product)
+    fake_catalog.add_product(1, title="From Catalog")
+    product_ids = [cached_product.id, database_product.id, favorite_product.id, 1, 2, 1]
+
+    url = reverse("bulk_add_favorite_products", args=[customer.id])
+    response = api_user_authenticated.post(url, {"product_ids": product_ids}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == [
+        {"product_id": cached_product.id, "status": "added"},
+        {"product_id": database_product.id, "status": "added"},
+        {"product_id": favorite_product.id, "status": "already_in_favorites"},
+        {"product_id": 1, "status": "added"},
+        {"product_id": 2, "status": "not_found"},
+    ]
+    number_of_products = 4
+    assert customer.favorite.products.count() == number_of_products
+    assert Product.objects.get(id=1).link == "http://challenge-api.luizalabs.com/api/product/1/"
+    assert get_cached_product(1).data["title"] == "From Catalog"
+    assert get_cached_product(2) == CachedProduct(None, stale=False)
+    assert get_cached_product(database_product.id) is not None
+
+
+@pytest.mark.django_db
+def test_bulk_add_products_query_count(api_user_authenticated, customer, fake_catalog, django_assert_num_queries):
+    products = ProductFactory.create_batch(20)
+    for product_id in range(1, 21):
+        fake_catalog.add_product(product_id)
+    product_ids = [product.id for product in products] + list(range(1, 21))
+
+    url = reverse("bulk_add_favorite_products", args=[customer.id])
+    with django_assert_num_queries(4):
+        response = api_user_authenticated.post(url, {"product_ids": product_ids}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert customer.favorite.products.count() == len(product_ids)
+
+
+@pytest.mark.django_db
+def test_bulk_add_products_catalog_unavailable(api_user_authenticated, customer, settings):
+    settings.CATALOG_API = {**settings.CATALOG_API, "BASE_URL": "http://127.0.0.1:1/", "MAX_RETRIES": 0}
+
+    url = reverse("bulk_add_favorite_products", args=[customer.id])
+    response = api_user_authenticated.post(url, {"product_ids": [1]}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == [{"product_id": 1, "status": "catalog_unavailable"}]
+
+
+@pytest.mark.django_db
+def test_bulk_add_products_validation(api_user_authenticated, customer, settings):
+    url = reverse("bulk_add_favorite_products", args=[customer.id])
+
+    response = api_user_authenticated.post(url, {"product_ids": []}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "product_ids" in response.json()
+
+    response = api_user_authenticated.post(url, {"product_ids": ["abc"]}, format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = api_user_authenticated.post(
+        url, {"product_ids": list(range(1, settings.FAVORITES_BULK_MAX_ITEMS + 2))}, format="json"
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_bulk_add_products_nonexistent_customer(api_user_authenticated):
+    url = reverse("bulk_add_favorite_products", args=[9999])
+    response = api_user_authenticated.post(url, {"product_ids": [1]}, format="json")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("number_of_products", [1, 10, 50])
+def test_get_favorite_products_query_count_is_constant(
+    api_user_authenticated, customer, number_of_products, django_assert_num_queries
+):
+    for product in ProductFactory.create_batch(number_of_products):
+        FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    with django_assert_num_queries(2):
+        response = api_user_authenticated.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == number_of_products
+
+
+@pytest.mark.django_db
+def test_get_favorite_products_keeps_insertion_order(api_user_authenticated, customer):
+    products = ProductFactory.create_batch(3)
+    for product in reversed(products):
+        FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.get(url)
+
+    assert [product_data["title"] for product_data in response.json()] == [
+        product.title for product in reversed(products)
+    ]
+    assert response.json()[0] == {
+        "title": products[-1].title,
+        "image": products[-1].image,
+        "price": str(Product.objects.get(id=products[-1].id).price),
+        "link": products[-1].link,
+        "review_score": products[-1].review_score,
+    }
+
+
+@pytest.mark.django_db
+def test_get_favorite_products_paginated(api_user_authenticated, customer):
+    products = ProductFactory.create_batch(5)
+    for product in products:
+        FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.get(url, {"page_size": 2})
+    first_page = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert first_page["previous"] is None
+    assert [product_data["title"] for product_data in first_page["results"]] == [
+        product.title for product in products[:2]
+    ]
+
+    FavoriteProduct.objects.create(favorite=customer.favorite, product=ProductFactory())
+    titles = [product_data["title"] for product_data in first_page["results"]]
+    next_url = first_page["next"]
+    while next_url:
+        page = api_user_authenticated.get(next_url).json()
+        titles += [product_data["title"] for product_data in page["results"]]
+        next_url = page["next"]
+
+    number_of_products = 6
+    assert len(titles) == number_of_products
+    assert titles[:5] == [product.title for product in products]
+
+
+@pytest.mark.django_db
+def test_get_favorite_products_pages_across_a_bulk_add(api_user_authenticated, customer):
+    products = ProductFactory.create_batch(7)
+    api_user_authenticated.post(
+        reverse("bulk_add_favorite_products", args=[customer.id]),
+        {"product_ids": [product.id for product in products]},
+        format="json",
+    )
+    assert FavoriteProduct.objects.filter(favorite=customer.favorite).values("created_at").distinct().count() == 1
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    pages = [api_user_authenticated.get(url, {"page_size": 2}).json()]
+    while pages[-1]["next"]:
+        pages.append(api_user_authenticated.get(pages[-1]["next"]).json())
+    forward = [product_data["title"] for page in pages for product_data in page["results"]]
+
+    backward = []
+    page = pages[-1]
+    while page["previous"]:
+        page = api_user_authenticated.get(page["previous"]).json()
+        backward = [product_data["title"] for product_data in page["results"]] + backward
+
+    expected = list(
+        FavoriteProduct.objects.filter(favorite=customer.favorite)
+        .order_by("id")
+        .values_list("product__title", flat=True)
+    )
+    assert len(expected) == len(products)
+    assert forward == expected
+    assert backward == expected[: -len(pages[-1]["results"])]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("position", ["2024-13-01T00:00:00+00:00,1", "2024-05-01T00:00:00+00:00,a", "1"])
+def test_get_favorite_products_invalid_cursor(api_user_authenticated, customer, position):
+    cursor = base64.b64encode(urlencode({"p": position}).encode()).decode()
+    url = reverse("add_favorite_product", args=[customer.id])
+
+    response = api_user_authenticated.get(url, {"cursor": cursor})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_get_favorite_products_page_size_is_capped(api_user_authenticated, customer):
+    for product in ProductFactory.create_batch(3):
+        FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.get(url, {"page_size": 100000})
+
+    number_of_products = 3
+    assert len(response.json()["results"]) == number_of_products
+
+
+@pytest.mark.django_db
+def test_get_favorite_products_streaming(api_user_authenticated, customer):
+    for product in ProductFactory.create_batch(3):
+        FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+    product = ProductFactory(review_score=None)
+    FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
+
+    url = reverse("add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.get(url, {"stream": "true"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    streamed = json.loads(b"".join(response.streaming_content))
+    assert streamed == api_user_authenticated.get(url).json()
+    assert "review_score" not in streamed[-1]
+
+
+@pytest.mark.django_db
+def test_get_favorite_products_streaming_empty(api_user_authenticated, customer):
+    url = reverse("add_favorite_product", args=[customer.id])
+    response = api_user_authenticated.get(url, {"stream": "1"})
+
+    assert json.loads(b"".join(response.streaming_content)) == []
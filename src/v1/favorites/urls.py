@@ -1,12 +1,27 @@
 from django.urls import path
 
-from v1.favorites.views import AddFavoriteProductView, DeleteFavoriteProductView
+from v1.favorites.views import (
+    AddFavoriteProductView,
+    AsyncAddFavoriteProductView,
+    AsyncDeleteFavoriteProductView,
+    BulkAddFavoriteProductsView,
+    DeleteFavoriteProductView,
+)
 
 urlpatterns = [
     path("customers/<int:customer_id>/", AddFavoriteProductView.as_view(), name="add_favorite_product"),
+    path("customers/<int:customer_id>/bulk/", BulkAddFavoriteProductsView.as_view(), name="bulk_add_favorite_products"),
     path(
         "customers/<int:customer_id>/products/<int:product_id>/",
         DeleteFavoriteProductView.as_view(),
         name="delete_favorite_product",
     ),
+    path(
+        "async/customers/<int:customer_id>/", AsyncAddFavoriteProductView.as_view(), name="async_add_favorite_product"
+    ),
+    path(
+        "async/customers/<int:customer_id>/products/<int:product_id>/",
+        AsyncDeleteFavoriteProductView.as_view(),
+        name="async_delete_favorite_product",
+    ),
 ]
@@ -1,119 +1,229 @@
-import requests
-from django.core.cache import cache
-from django.db import transaction
+from adrf.views import APIView as AsyncAPIView
+from asgiref.sync import sync_to_async
+from django.conf import settings
 
 # import JsonResponse
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from v1.common.pagination import CreatedAtCursorPagination
+from v1.common.replicas import ReplicaReadMixin, pin_to_primary, user_pin_key
+from v1.common.streaming import stream_json_array
 from v1.customers.models import Customer
-from v1.favorites.models import FavoriteProduct, Product
+from v1.favorites.caches import (
+    favorites_pin_key,
+    get_cached_favorites,
+    invalidate_cached_favorites,
+    set_cached_favorites,
+)
+from v1.favorites.catalog import CatalogUnavailable
+from v1.favorites.models import Favorite, FavoriteProduct, Product
+from v1.favorites.products import aget_product, get_or_enqueue_product, get_product, resolve_products
+from v1.favorites.serializers import BulkFavoriteProductsSerializer
+
+FAVORITE_PRODUCT_LIST_FIELDS = (
+    "product__title",
+    "product__image",
+    "product__price",
+    "product__link",
+    "product__review_score",
+)
+
+
+def favorite_product_rows(customer_id):
+    return (
+        FavoriteProduct.objects.listed()
+        .filter(favorite_id=customer_id)
+        .order_by("created_at", "id")
+        .values("id", "created_at", *FAVORITE_PRODUCT_LIST_FIELDS)
+    )
+
+
+def favorite_product_data(row):
+    product_data = {
+        "title": row["product__title"],
+        "image": row["product__image"],
+        "price": str(row["product__price"]),
+        "link": row["product__link"],
+    }
+    if row["product__review_score"] is not None:
+        product_data["review_score"] = row["product__review_score"]
+    return product_data
+
+
+def added_response(product):
+    if product.status == Product.Status.PENDING:
+        # Recorded, but the product details are still being fetched from the catalog.
+        return JsonResponse(
+            {"message": "Product added to favorites; its details are being fetched."}, status=status.HTTP_202_ACCEPTED
+        )
+    return JsonResponse({"message": "Product added to favorites successfully."}, status=status.HTTP_201_CREATED)
+
+
+class FavoritesReplicaReadMixin(ReplicaReadMixin):
+    @classmethod
+    def replica_pin_keys(cls, request):
+        customer_id = request.parser_context["kwargs"]["customer_id"]
+        return [*super().replica_pin_keys(request), favorites_pin_key(customer_id)]
 
 
-class AddFavoriteProductView(APIView):
+class AddFavoriteProductView(FavoritesReplicaReadMixin, APIView):
     permission_classes = (IsAuthenticated,)
 
     @classmethod
     def post(cls, request, customer_id):
-        try:
-            customer = Customer.objects.get(id=customer_id)
-        except Customer.DoesNotExist:
+        if not Favorite.objects.filter(pk=customer_id).exists():
             return JsonResponse({"error": "Customer not found."}, status=status.HTTP_404_NOT_FOUND)
 
         product_id = request.data.get("product_id")
 
         if not product_id:
             return JsonResponse({"error": "product_id is required."}, status=status.HTTP_400_BAD_REQUEST)
-        cached_product = cache.get(product_id)
-
-        if cached_product:
-            product = Product(**cached_product)
-        else:
-            try:
-                product = Product.objects.get(id=product_id)
-                cache.set(
-                    product_id,
-                    {
-                        "id": product.id,
-                        "title": product.title,
-                        "image": product.image,
-                        "price": str(product.price),
-                        "review_score": product.review_score,
-                    },
-                )
-            except Product.DoesNotExist:
-                response = requests.get(f"http://challenge-api.luizalabs.com/api/product/{product_id}/")
-
-                if response.status_code == status.HTTP_200_OK:
-                    product_data = response.json()
-                    with transaction.atomic():
-                        product = Product.objects.create(
-                            id=product_data["id"],
-                            title=product_data["title"],
-                            image=product_data["image"],
-                            price=product_data["price"],
-                            review_score=product_data.get("review_score", None),
-                        )
-                        cache.set(
-                            product_id,
-                            {
-                                "id": product.id,
-                                "title": product.title,
-                                "image": product.image,
-                                "price": str(product.price),
-                                "review_score": product.review_score,
-                            },
-                        )
-                else:
-                    return JsonResponse({"error": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
-
-        customer = Customer.objects.get(id=customer_id)
-
-        if FavoriteProduct.objects.filter(favorite__customer=customer, product=product).exists():
+        try:
+            if settings.FAVORITES_ASYNC_CATALOG_RESOLUTION:
+                product = get_or_enqueue_product(product_id)
+            else:
+                product = get_product(product_id)
+        except CatalogUnavailable:
+            return JsonResponse({"error": "Product catalog unavailable."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        if product is None:
+            return JsonResponse({"error": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        if not FavoriteProduct.objects.add_product(customer_id, product.id):
             return JsonResponse({"error": "Product is already in favorites."}, status=status.HTTP_400_BAD_REQUEST)
 
-        FavoriteProduct.objects.create(favorite=customer.favorite, product=product)
-        return JsonResponse({"message": "Product added to favorites successfully."}, status=status.HTTP_201_CREATED)
+        invalidate_cached_favorites(customer_id)
+        return added_response(product)
 
     @classmethod
     def get(cls, request, customer_id):
-        customer = get_object_or_404(Customer, id=customer_id)
-        favorite_products = FavoriteProduct.objects.filter(favorite__customer=customer)
-        products_data = []
-
-        for favorite_product in favorite_products:
-            product = favorite_product.product
-            product_data = {
-                "title": product.title,
-                "image": product.image,
-                "price": str(product.price),
-                "link": product.link,
-            }
-            if product.review_score is not None:
-                product_data["review_score"] = product.review_score
-
-            products_data.append(product_data)
+        stream = request.query_params.get("stream") in {"1", "true"}
+        paginate = bool({"cursor", "page_size"} & request.query_params.keys())
 
-        return Response(products_data, status=status.HTTP_200_OK)
+        if not stream and not paginate:
+            products_data, version = get_cached_favorites(customer_id)
+            if products_data is None:
+                get_object_or_404(Customer, id=customer_id)
+                products_data = [favorite_product_data(row) for row in favorite_product_rows(customer_id)]
+                set_cached_favorites(customer_id, version, products_data)
+            return Response(products_data, status=status.HTTP_200_OK)
 
+        get_object_or_404(Customer, id=customer_id)
+        rows = favorite_product_rows(customer_id)
 
-class DeleteFavoriteProductView(APIView):
+        if stream:
+            rows = rows.iterator(chunk_size=settings.FAVORITES_STREAM_CHUNK_SIZE)
+            return StreamingHttpResponse(
+                stream_json_array(favorite_product_data(row) for row in rows), content_type="application/json"
+            )
+
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(rows, request)
+        return paginator.get_paginated_response([favorite_product_data(row) for row in page])
+
+
+class DeleteFavoriteProductView(FavoritesReplicaReadMixin, APIView):
     permission_classes = (IsAuthenticated,)
 
     @classmethod
     def delete(cls, request, customer_id, product_id):
-        customer = get_object_or_404(Customer, id=customer_id)
+        get_object_or_404(Customer, id=customer_id)
 
         product = get_object_or_404(Product, id=product_id)
-        favorite = customer.favorite
 
-        favorite_product = FavoriteProduct.objects.filter(favorite=favorite, product=product).first()
+        favorite_product = FavoriteProduct.objects.filter(favorite_id=customer_id, product=product).first()
         if not favorite_product:
             return Response({"detail": "Product is not in favorites."}, status=status.HTTP_400_BAD_REQUEST)
 
         favorite_product.delete()
         return Response({"detail": "Product removed from favorites."}, status=status.HTTP_204_NO_CONTENT)
+
+
+class BulkAddFavoriteProductsView(FavoritesReplicaReadMixin, APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @classmethod
+    def post(cls, request, customer_id):
+        get_object_or_404(Customer, id=customer_id)
+        serializer = BulkFavoriteProductsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        product_ids = serializer.validated_data["product_ids"]
+
+        products, unavailable = resolve_products(product_ids)
+        added = FavoriteProduct.objects.add_products(customer_id, products) if products else set()
+        if added:
+            invalidate_cached_favorites(customer_id)
+
+        results = []
+        for product_id in product_ids:
+            if product_id in added:
+                result = "added"
+            elif product_id in products:
+                result = "already_in_favorites"
+            elif product_id in unavailable:
+                result = "catalog_unavailable"
+            else:
+                result = "not_found"
+            results.append({"product_id": product_id, "status": result})
+
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class AsyncAddFavoriteProductView(AsyncAPIView):
+    # adrf runs initial() through sync_to_async, so the async views cannot switch reads to a replica like
+    # ReplicaReadMixin does. They read from the primary and pin the writer after a write.
+    permission_classes = (IsAuthenticated,)
+
+    @classmethod
+    async def post(cls, request, customer_id):
+        if not await Favorite.objects.filter(pk=customer_id).aexists():
+            return JsonResponse({"error": "Customer not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        product_id = request.data.get("product_id")
+
+        if not product_id:
+            return JsonResponse({"error": "product_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            if settings.FAVORITES_ASYNC_CATALOG_RESOLUTION:
+                product = await sync_to_async(get_or_enqueue_product)(product_id)
+            else:
+                product = await aget_product(product_id)
+        except CatalogUnavailable:
+            return JsonResponse({"error": "Product catalog unavailable."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        if product is None:
+            return JsonResponse({"error": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        if not await FavoriteProduct.objects.aadd_product(customer_id, product.id):
+            return JsonResponse({"error": "Product is already in favorites."}, status=status.HTTP_400_BAD_REQUEST)
+
+        await sync_to_async(invalidate_cached_favorites)(customer_id)
+        await sync_to_async(pin_to_primary)(user_pin_key(request.user))
+        return added_response(product)
+
+    @classmethod
+    async def get(cls, request, customer_id):
+        await aget_object_or_404(Customer, id=customer_id)
+        products_data = [favorite_product_data(row) async for row in favorite_product_rows(customer_id)]
+        return Response(products_data, status=status.HTTP_200_OK)
+
+
+class AsyncDeleteFavoriteProductView(AsyncAPIView):
+    permission_classes = (IsAuthenticated,)
+
+    @classmethod
+    async def delete(cls, request, customer_id, product_id):
+        await aget_object_or_404(Customer, id=customer_id)
+        product = await aget_object_or_404(Product, id=product_id)
+
+        deleted, _ = await FavoriteProduct.objects.filter(favorite_id=customer_id, product=product).adelete()
+        if not deleted:
+            return Response({"detail": "Product is not in favorites."}, status=status.HTTP_400_BAD_REQUEST)
+
+        await sync_to_async(pin_to_primary)(user_pin_key(request.user))
+        return Response({"detail": "Product removed from favorites."}, status=status.HTTP_204_NO_CONTENT)
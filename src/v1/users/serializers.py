@@ -1,12 +1,13 @@
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework import serializers
 
+from v1.common.serializers import DynamicFieldsMixin
 from v1.favorites.serializers import FavoriteSerializer
 
 CustomUser = get_user_model()
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     favorite = FavoriteSerializer(read_only=True)
 
     class Meta:
@@ -16,6 +17,7 @@ class CustomUserSerializer(serializers.ModelSerializer):
             "email",
             "favorite",
         )
+        expandable_fields = ("favorite",)
 
 
 class CustomUserLoginSerializer(serializers.Serializer):
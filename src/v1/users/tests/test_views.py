@@ -133,3 +133,11 @@ def test_delete_user_data(api_user_authenticated, normal_user):
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
     assert not User.objects.filter(id=normal_user.id).exists()
+
+
+@pytest.mark.django_db
+def test_retrieve_user_info_sparse_fields(api_user_authenticated, normal_user):
+    response = api_user_authenticated.get(reverse("user_retrieve_update_destroy"), {"fields": "email"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {"email": normal_user.email}
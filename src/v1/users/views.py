@@ -4,6 +4,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from v1.common.replicas import ReplicaReadMixin
 from v1.users.serializers import (
     CustomUserLoginSerializer,
     CustomUserSerializer,
@@ -41,7 +42,7 @@ class CustomUserLogoutAPIView(GenericAPIView):
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
 
-class CustomUserRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView):
+class CustomUserRetrieveUpdateDestroy(ReplicaReadMixin, RetrieveUpdateDestroyAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = CustomUserSerializer
 